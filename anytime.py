@@ -0,0 +1,135 @@
+from frontier import make_frontier
+from moves import neighbour_table
+from packed_state import PackedState, pack, slide
+from utils import (PROGRESS_INTERVAL, SearchLimitReached, check_limits, make_evaluator,
+                   reconstruct_moves)
+
+# Default weight schedule: start at 3 and step down by 0.5 to plain A*
+DEFAULT_INITIAL_WEIGHT = 3.0
+DEFAULT_WEIGHT_STEP = 0.5
+
+
+def anytimeSearch(puzzle, heuristic, initial_weight=DEFAULT_INITIAL_WEIGHT, weight_step=DEFAULT_WEIGHT_STEP,
+                  max_nodes=None, deadline=None, progress=None, frontier="auto", instrument=None):
+    """
+    Anytime Repairing A* (ARA*): yield better and better solutions until one is proven optimal.
+
+    The first pass is weighted A* with a large weight, which finds a
+    solution quickly. Every later pass lowers the weight and reuses the
+    previous work: only states whose cost improved since they were
+    expanded are searched again. Each solution comes with a proven bound
+    on how far it can be from optimal (for an admissible, consistent
+    heuristic): min(weight, cost / smallest g + h still open).
+
+    Hitting max_nodes or the deadline ends the sequence quietly once there
+    is a solution; before the first one it raises SearchLimitReached.
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: A heuristic function to evaluate states.
+        initial_weight (float): Weight of the first pass.
+        weight_step (float): How much the weight drops after every pass.
+        max_nodes (int): Stop after expanding this many nodes in total.
+        deadline (float): Stop once time.time() passes this value.
+        progress (callable): Called every PROGRESS_INTERVAL expansions with a
+                             dict of "expanded", "generated", "frontier" and "weight".
+        frontier (str): Open list kind, see bestFirstSearch.
+        instrument (Instrumentation): Per-pass stats (one layer per weight), see instrumentation.py.
+    Yields:
+        moves (list): The best solution so far.
+        stats (dict): Search counters ("expanded", "generated", "duplicates") so far, plus
+                      "weight" of the pass and "bound", the proven
+                      suboptimality factor (1.0 means optimal).
+    """
+    start_state = PackedState(puzzle.state)
+    goal_key = pack(puzzle.goal)
+    dimension = puzzle.dimension
+    cells = start_state.cells
+    neighbours = neighbour_table(dimension)
+    evaluate, costs = make_evaluator(heuristic, dimension, puzzle.goal, instrument)
+
+    start_h = evaluate(start_state)
+    best_g = {start_state.key: 0}
+    parent_map = {}
+    nodes = {start_state.key: (start_h, start_state.blank)}  # key -> (h, blank) of every generated state
+    open_nodes = {start_state.key}  # Waiting for expansion in this pass
+    inconsistent = set()  # Improved after their expansion in this pass; reopened in the next
+    expanded = 0
+    generated = 1
+    duplicates = 0
+    best_cost = None
+    weight = max(1.0, initial_weight)
+
+    def improve_path(weight):
+        """One weighted A* pass: expand until no open state can beat the goal's cost."""
+        nonlocal expanded, generated, duplicates
+        if float(weight).is_integer():
+            weight = int(weight)  # Keeps priorities integral for the bucket frontier
+        open_list = make_frontier(frontier, isinstance(start_h, int) and isinstance(weight, int))
+        for key in open_nodes:
+            h, blank = nodes[key]
+            open_list.push(best_g[key] + weight * h, h, (best_g[key], key))
+        closed = set()
+
+        while open_list and open_list.min_priority() < best_g.get(goal_key, float("inf")):
+            g, key = open_list.pop()
+            if key not in open_nodes or g != best_g[key]:
+                duplicates += 1
+                continue  # Stale entry: expanded already or reached more cheaply since
+            open_nodes.discard(key)
+            closed.add(key)
+            expanded += 1
+            check_limits(expanded, max_nodes, deadline)
+            if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+                progress({"expanded": expanded, "generated": generated, "frontier": len(open_nodes),
+                          "weight": weight})
+            if instrument is not None:
+                instrument.expand(weight, len(open_nodes), len(closed), expanded, generated)
+
+            h, zero_index = nodes[key]
+            for new_zero_index, move in neighbours[zero_index]:
+                neighbor_key, tile = slide(key, zero_index, new_zero_index)
+                new_g = g + 1
+                if new_g >= best_g.get(neighbor_key, new_g + 1):
+                    duplicates += 1
+                    continue
+                best_g[neighbor_key] = new_g
+                parent_map[neighbor_key] = move
+                if neighbor_key not in nodes:
+                    if costs is not None:
+                        new_h = h - costs[tile][new_zero_index] + costs[tile][zero_index]
+                    else:
+                        new_h = evaluate(PackedState.from_key(neighbor_key, cells, new_zero_index))
+                    nodes[neighbor_key] = (new_h, new_zero_index)
+                    generated += 1
+                if neighbor_key in closed:
+                    inconsistent.add(neighbor_key)
+                else:
+                    open_nodes.add(neighbor_key)
+                    open_list.push(new_g + weight * nodes[neighbor_key][0], nodes[neighbor_key][0],
+                                   (new_g, neighbor_key))
+
+    while True:
+        try:
+            improve_path(weight)
+        except SearchLimitReached:
+            if best_cost is None:
+                raise
+            return  # Out of budget: the last solution yielded stands
+        if goal_key not in best_g:
+            raise ValueError("No solution found!")
+
+        cost = best_g[goal_key]
+        # Every state that could still lead to a shorter path is open or inconsistent
+        lower = min((best_g[key] + nodes[key][0] for key in open_nodes | inconsistent), default=cost)
+        bound = min(weight, cost / lower) if lower > 0 else 1.0
+        if best_cost is None or cost <= best_cost:
+            best_cost = cost
+            moves = reconstruct_moves(parent_map, goal_key, nodes[goal_key][1], dimension)
+            yield moves, {"expanded": expanded, "generated": generated, "duplicates": duplicates,
+                         "weight": weight, "bound": max(1.0, bound)}
+        if bound <= 1.0 or weight == 1.0:
+            return
+
+        weight = max(1.0, weight - weight_step)
+        open_nodes |= inconsistent
+        inconsistent.clear()
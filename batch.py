@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from heuristics import HEURISTICS, warm_tables
+from puzzle import N_Puzzle
+from utils import SearchLimitReached, search
+
+
+def parse_state_line(line, number):
+    """
+    Parse one input line into a task dict.
+
+    Accepted forms:
+        {"id": "a", "state": [1, 2, ...], "goal": [...]}  (id and goal optional)
+        [1, 2, 3, ...]
+        1 2 3 ...   or   1,2,3,...
+    Raises:
+        ValueError: If the line is none of these.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line[0] in "[{":
+        data = json.loads(line)
+        if isinstance(data, list):
+            data = {"state": data}
+        elif "state" not in data:
+            raise ValueError("no \"state\" in the request")
+    else:
+        data = {"state": [int(tile) for tile in line.replace(",", " ").split()]}
+    data.setdefault("id", number)
+    return data
+
+
+def read_states(lines):
+    """
+    Yield task dicts from an iterable of lines (JSONL or one state per line).
+
+    A line that cannot be parsed becomes a task holding only its "id" and
+    an "error", which solve_task turns into an error record, so one bad
+    line does not end the stream.
+    """
+    for number, line in enumerate(lines):
+        try:
+            task = parse_state_line(line, number)
+        except ValueError as error:
+            task = {"id": number, "error": f"line {number + 1}: {error}"}
+        if task is not None:
+            yield task
+
+
+def check_state(state, name="state"):
+    """
+    Check that a state is a square board holding each tile 0 .. n*n - 1 once.
+
+    Returns:
+        int: The board dimension.
+    Raises:
+        ValueError: Describing what is wrong with the state.
+    """
+    if not isinstance(state, (list, tuple)) or not all(type(tile) is int for tile in state):
+        raise ValueError(f"The {name} must be a list of integer tiles")
+    dimension = int(round(len(state) ** 0.5))
+    if dimension < 2 or dimension * dimension != len(state):
+        raise ValueError(f"The {name} has {len(state)} tiles, which is not a square board")
+    if sorted(state) != list(range(len(state))):
+        raise ValueError(f"The {name} must hold each tile 0 .. {len(state) - 1} exactly once")
+    return dimension
+
+
+def task_dimension(task):
+    """Check a task's state and goal; returns the board dimension or raises ValueError."""
+    if "error" in task:
+        raise ValueError(task["error"])
+    dimension = check_state(task.get("state"))
+    if task.get("goal") is not None and check_state(task["goal"], "goal") != dimension:
+        raise ValueError("The goal and the state are different board sizes")
+    return dimension
+
+
+def solve_task(task, heuristic_name="manhattan", algorithm="astar", timeout=None, max_nodes=None, options=None):
+    """Solve a single task dict and return a JSON-friendly result dict."""
+    result = {"id": task.get("id")}
+    start_time = time.time()
+    deadline = start_time + timeout if timeout else None
+    try:
+        dimension = task_dimension(task)
+        puzzle = N_Puzzle(dimension, state=list(task["state"]), goal=task.get("goal"))
+        moves, stats = search(puzzle, HEURISTICS[heuristic_name], algorithm,
+                              max_nodes=max_nodes, deadline=deadline, **(options or {}))
+        result.update(status="solved", moves=moves, num_moves=len(moves),
+                      expanded=stats["expanded"], generated=stats["generated"])
+    except SearchLimitReached as error:
+        result.update(status=error.reason, expanded=error.expanded)
+    except ValueError as error:
+        result.update(status="error", error=str(error))
+    except Exception as error:  # One broken task must not end a batch
+        result.update(status="error", error=f"{type(error).__name__}: {error}")
+    result["time"] = time.time() - start_time
+    return result
+
+
+def _solve_chunk(tasks, heuristic_name, algorithm, timeout, max_nodes, options):
+    return [solve_task(task, heuristic_name, algorithm, timeout, max_nodes, options) for task in tasks]
+
+
+def _chunks(tasks, chunksize):
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_batch(tasks, heuristic="manhattan", algorithm="astar", workers=None, chunksize=8,
+                timeout=None, max_nodes=None, **options):
+    """
+    Solve a stream of tasks on a process pool, yielding results in completion order.
+
+    Args:
+        tasks: Iterable of task dicts (see parse_state_line). It is consumed
+               lazily, so it may be an endless stream.
+        heuristic (str): A key of heuristics.HEURISTICS.
+        algorithm (str): Any algorithm accepted by utils.search.
+        workers (int): Worker processes (defaults to the CPU count).
+        chunksize (int): Tasks sent to a worker in one go.
+        timeout (float): Per-task time limit in seconds.
+        max_nodes (int): Per-task node expansion limit.
+        **options: Extra options for the search engine (e.g. weight=2.0).
+    Yields:
+        dict: One result per task, see solve_task.
+    """
+    # Imported here so scripts that only need solve_task start quickly
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic: {heuristic}")
+    workers = workers or os.cpu_count() or 1
+    tasks = iter(tasks)
+    head = []
+    for task in tasks:
+        head.append(task)
+        if "error" not in task:
+            break
+    if not head:
+        return
+
+    # Build the read-only tables once in the parent. Forked workers inherit
+    # them (and the memory-mapped pattern databases share the page cache)
+    # instead of rebuilding them per process.
+    try:
+        warm_tables(HEURISTICS[heuristic], task_dimension(head[-1]), head[-1].get("goal"))
+    except ValueError:
+        pass  # solve_task reports the bad task
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    def all_tasks():
+        yield from head
+        yield from tasks
+
+    chunks = _chunks(all_tasks(), chunksize)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = set()
+        # Keep a couple of chunks queued per worker so none sit idle
+        for chunk in chunks:
+            pending.add(executor.submit(_solve_chunk, chunk, heuristic, algorithm, timeout, max_nodes, options))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(executor.submit(_solve_chunk, chunk, heuristic, algorithm, timeout, max_nodes, options))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many N-puzzle states in parallel.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL or one-state-per-line file (default: stdin)")
+    parser.add_argument("--heuristic", default="manhattan", choices=sorted(HEURISTICS))
+    parser.add_argument("--algorithm", default="astar")
+    parser.add_argument("--weight", type=float, help="weight for the weighted algorithm")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=None, help="per-task time limit in seconds")
+    parser.add_argument("--max-nodes", type=int, default=None, help="per-task node expansion limit")
+    args = parser.parse_args(argv)
+
+    options = {"weight": args.weight} if args.weight is not None else {}
+    source = sys.stdin if args.input == "-" else open(args.input)
+    all_solved = True
+    try:
+        for result in solve_batch(read_states(source), args.heuristic, args.algorithm, args.workers,
+                                  args.chunksize, args.timeout, args.max_nodes, **options):
+            all_solved = all_solved and result["status"] == "solved"
+            print(json.dumps(result), flush=True)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    # Like solve.py: 1 if any state was not solved
+    return 0 if all_solved else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
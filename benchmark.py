@@ -0,0 +1,269 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+
+from distance_table import load_distance_table
+from heuristics import HEURISTICS, warm_tables
+from puzzle import N_Puzzle
+from solvability import generate_solvable_state
+from moves import OPPOSITE_MOVES, neighbour_table
+from pattern_database import MAX_BUILD_DIMENSION, default_path
+from utils import ALGORITHMS, OPTIMAL_ALGORITHMS, SearchLimitReached, search
+
+# custom_heuristic doubles the Manhattan distance, so it can overestimate
+INADMISSIBLE_HEURISTICS = ("custom",)
+
+DEFAULT_ALGORITHMS = ALGORITHMS
+DEFAULT_HEURISTICS = ("manhattan", "linear_conflict", "walking_distance", "pattern_database", "misplaced")
+
+
+def random_instances(dimension, count, seed):
+    """Uniformly random solvable states, reproducible from the seed."""
+    rng = random.Random(seed)
+    return [{"state": generate_solvable_state(dimension, rng=rng)} for _ in range(count)]
+
+
+def scrambled_instances(dimension, depth, count, seed):
+    """States reached by `depth` random moves from the goal, never undoing the last move."""
+    rng = random.Random(seed)
+    goal = list(range(1, dimension * dimension)) + [0]
+    instances = []
+    for _ in range(count):
+        state = goal[:]
+        zero_index = state.index(0)
+        previous_move = None
+        for _ in range(depth):
+            options = [(move, target) for target, move in neighbour_table(dimension)[zero_index]
+                       if move != OPPOSITE_MOVES.get(previous_move)]
+            previous_move, new_zero_index = rng.choice(options)
+            state[zero_index], state[new_zero_index] = state[new_zero_index], 0
+            zero_index = new_zero_index
+        instances.append({"state": state})
+    return instances
+
+
+def load_korf100(path):
+    """
+    Load Korf's 100 random 15-puzzle instances.
+
+    Each line holds the 16 tiles (0 is the blank), optionally preceded by the
+    instance number and followed by the optimal solution length. The goal
+    of this set has the blank in the top-left corner.
+    """
+    instances = []
+    with open(path) as f:
+        for line in f:
+            numbers = [int(value) for value in line.replace(",", " ").split()]
+            if not numbers:
+                continue
+            if len(numbers) in (17, 18):
+                numbers = numbers[1:]  # Drop the instance number
+            state, rest = numbers[:16], numbers[16:]
+            instance = {"state": state, "goal": list(range(16))}
+            if rest:
+                instance["optimal"] = rest[0]
+            instances.append(instance)
+    return instances
+
+
+def build_suites(names, korf100_path=None):
+    """The named instance sets; every one is generated from a fixed seed."""
+    suites = {}
+    for name in names:
+        if name == "8puzzle":
+            suites[name] = random_instances(3, 20, seed=8)
+        elif name == "scramble-4x4":
+            suites[name] = scrambled_instances(4, 30, 10, seed=15)
+        elif name == "scramble-5x5":
+            suites[name] = scrambled_instances(5, 30, 5, seed=24)
+        elif name == "korf100":
+            if korf100_path is None:
+                raise ValueError("the korf100 suite needs --korf100 <file>")
+            suites[name] = load_korf100(korf100_path)
+        else:
+            raise ValueError(f"Unknown suite: {name}")
+    return suites
+
+
+def _unsupported(instance, heuristic_name):
+    """Why a heuristic cannot run on an instance, or None if it can."""
+    if heuristic_name != "pattern_database":
+        return None
+    dimension = int(round(len(instance["state"]) ** 0.5))
+    default_goal = list(range(1, dimension * dimension)) + [0]
+    if instance.get("goal") is not None and list(instance["goal"]) != default_goal:
+        return "the pattern database only covers the default goal"
+    if dimension > MAX_BUILD_DIMENSION and not os.path.exists(default_path(dimension)):
+        return f"no {dimension}x{dimension} pattern database (build it with `python pattern_database.py {dimension}`)"
+    return None
+
+
+def _run_case(instance, algorithm, heuristic_name, timeout, max_nodes):
+    """Solve one instance; runs in a fresh process so peak RSS is per case."""
+    state = instance["state"]
+    dimension = int(round(len(state) ** 0.5))
+    puzzle = N_Puzzle(dimension, state=state, goal=instance.get("goal"))
+    options = {"weight": 2.0} if algorithm == "weighted" else {}
+    result = {"expanded": 0}
+    try:
+        # Table builds are one-off setup, not search time
+        warm_tables(HEURISTICS[heuristic_name], dimension, instance.get("goal"))
+        if algorithm == "table":
+            load_distance_table(dimension)
+    except Exception as error:
+        result.update(status="error", error=str(error), wall_time=0.0, nodes_per_sec=None)
+        return result
+    deadline = time.time() + timeout if timeout else None
+    start_time = time.perf_counter()
+    try:
+        moves, stats = search(puzzle, HEURISTICS[heuristic_name], algorithm,
+                              max_nodes=max_nodes, deadline=deadline, **options)
+        result.update(status="solved", moves=len(moves), expanded=stats["expanded"], generated=stats["generated"])
+    except SearchLimitReached as error:
+        result.update(status=error.reason, expanded=error.expanded)
+    except Exception as error:  # One broken combination must not end the whole run
+        result.update(status="error", error=str(error))
+    wall_time = time.perf_counter() - start_time
+    result["wall_time"] = wall_time
+    result["nodes_per_sec"] = result["expanded"] / wall_time if wall_time > 0 else None
+    result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def run_benchmarks(suites, algorithms=DEFAULT_ALGORITHMS, heuristics=DEFAULT_HEURISTICS,
+                   timeout=30.0, max_nodes=2000000):
+    """
+    Run every algorithm x heuristic combination on every instance.
+
+    Returns:
+        list: One result dict per (suite, instance, algorithm, heuristic).
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for suite_name, instances in suites.items():
+        for number, instance in enumerate(instances):
+            case_results = []
+            for algorithm in algorithms:
+                # Bidirectional BFS ignores the heuristic, so run it once
+                names = heuristics[:1] if algorithm == "bidirectional" else heuristics
+                for heuristic_name in names:
+                    reason = _unsupported(instance, heuristic_name)
+                    if reason is not None:
+                        print(f"{suite_name}#{number} {algorithm}/{heuristic_name}: skipped, {reason}",
+                              file=sys.stderr)
+                        continue
+                    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+                        case = pool.apply(_run_case, (instance, algorithm, heuristic_name, timeout, max_nodes))
+                    case.update(suite=suite_name, instance=number, algorithm=algorithm, heuristic=heuristic_name)
+                    case_results.append(case)
+                    print(f"{suite_name}#{number} {algorithm}/{heuristic_name}: {case['status']} "
+                          f"moves={case.get('moves')} expanded={case['expanded']} "
+                          f"time={case['wall_time']:.3f}s" + (f" ({case['error']})" if "error" in case else ""),
+                          file=sys.stderr)
+
+            # Optimal length: known for the instance, or the best proven-optimal result
+            optimal = instance.get("optimal")
+            if optimal is None:
+                lengths = [case["moves"] for case in case_results
+                           if case["status"] == "solved" and case["algorithm"] in OPTIMAL_ALGORITHMS
+                           and case["heuristic"] not in INADMISSIBLE_HEURISTICS]
+                optimal = min(lengths) if lengths else None
+            for case in case_results:
+                case["optimal"] = optimal
+                if optimal and case["status"] == "solved":
+                    case["length_ratio"] = case["moves"] / optimal
+            results.extend(case_results)
+    return results
+
+
+def compare(baseline, results, node_tolerance=0.05, time_tolerance=0.25):
+    """
+    List regressions of `results` against a baseline run.
+
+    A case regresses when it no longer solves, returns a longer solution,
+    expands more than node_tolerance more nodes, or takes more than
+    time_tolerance longer.
+    """
+    def key(case):
+        return case["suite"], case["instance"], case["algorithm"], case["heuristic"]
+
+    previous = {key(case): case for case in baseline["results"]}
+    regressions = []
+    for case in results:
+        old = previous.get(key(case))
+        if old is None:
+            continue
+        name = "{}#{} {}/{}".format(*key(case))
+        if old["status"] == "solved" and case["status"] != "solved":
+            regressions.append(f"{name}: was solved, now {case['status']}")
+            continue
+        if case["status"] != "solved" or old["status"] != "solved":
+            continue
+        if case["moves"] > old["moves"]:
+            regressions.append(f"{name}: solution length {old['moves']} -> {case['moves']}")
+        if case["expanded"] > old["expanded"] * (1 + node_tolerance):
+            regressions.append(f"{name}: nodes expanded {old['expanded']} -> {case['expanded']}")
+        if case["wall_time"] > old["wall_time"] * (1 + time_tolerance):
+            regressions.append(f"{name}: wall time {old['wall_time']:.3f}s -> {case['wall_time']:.3f}s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the N-puzzle solvers.")
+    parser.add_argument("--suite", action="append", help="8puzzle, scramble-4x4, scramble-5x5 or korf100")
+    parser.add_argument("--korf100", help="file with Korf's 100 15-puzzle instances")
+    parser.add_argument("--algorithm", action="append", help="algorithms to run (default: all)")
+    parser.add_argument("--heuristic", action="append", help="heuristics to run (default: all but custom/euclidean)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-case time limit in seconds")
+    parser.add_argument("--max-nodes", type=int, default=2000000, help="per-case node expansion limit")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    parser.add_argument("--node-tolerance", type=float, default=0.05)
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    # In compare mode, rerun exactly what the baseline ran unless told otherwise
+    settings = baseline["meta"] if baseline else {}
+    suite_names = args.suite or settings.get("suites") or ["8puzzle"]
+    algorithms = tuple(args.algorithm or settings.get("algorithms") or DEFAULT_ALGORITHMS)
+    heuristics = tuple(args.heuristic or settings.get("heuristics") or DEFAULT_HEURISTICS)
+
+    results = run_benchmarks(build_suites(suite_names, args.korf100), algorithms, heuristics,
+                             args.timeout, args.max_nodes)
+    report = {
+        "meta": {
+            "suites": suite_names,
+            "algorithms": list(algorithms),
+            "heuristics": list(heuristics),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timeout": args.timeout,
+            "max_nodes": args.max_nodes,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(baseline, results, args.node_tolerance, args.time_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import mmap
+import os
+import struct
+import sys
+
+from external_bfs import external_bfs, iter_layer
+from moves import MutableBoard, neighbour_table
+from packed_state import PackedState, unpack
+from pattern_database import TABLE_DIR, UNREACHED
+from ranking import solvable_count, solvable_index
+import solvability
+
+# File layout: header, goal, then one byte per solvable_index, page aligned
+TABLE_MAGIC = b"NDST"
+TABLE_VERSION = 1
+HEADER_FORMAT = "<4sHH"  # magic, version, dimension
+
+# Largest board whose full table is practical (the 4x4 one would need 10^13 bytes)
+MAX_TABLE_DIMENSION = 3
+
+
+def build_distance_table(dimension=3, goal=None, work_dir=None):
+    """
+    Distance to the goal of every reachable state, by breadth-first search back from the goal.
+
+    Moves are reversible, so the BFS depth of a state from the goal is its
+    optimal solution length. With a work_dir, the search runs on disk (see
+    external_bfs) and can be resumed if interrupted.
+
+    Returns:
+        bytearray: Distance for every solvable_index.
+    """
+    if dimension > MAX_TABLE_DIMENSION:
+        raise ValueError(f"A full distance table is only practical up to {MAX_TABLE_DIMENSION}x{MAX_TABLE_DIMENSION}")
+    goal = goal or list(range(1, dimension * dimension)) + [0]
+    table = bytearray([UNREACHED]) * solvable_count(dimension * dimension)
+    if work_dir is not None:
+        cells = dimension * dimension
+        for depth in range(len(external_bfs(goal, dimension, work_dir))):
+            for key in iter_layer(work_dir, depth, cells):
+                table[solvable_index(unpack(key, cells))] = depth
+        return table
+    neighbours = neighbour_table(dimension)
+    table[solvable_index(goal)] = 0
+    layer = [PackedState(goal)]
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for state in layer:
+            for target, _ in neighbours[state.blank]:
+                child = state.slide(target)
+                index = solvable_index(child.tolist())
+                if table[index] == UNREACHED:
+                    table[index] = distance
+                    next_layer.append(child)
+        layer = next_layer
+    return table
+
+
+def save_distance_table(path, dimension, goal, table):
+    """Write a table to a versioned binary file."""
+    header = struct.pack(HEADER_FORMAT, TABLE_MAGIC, TABLE_VERSION, dimension) + bytes(goal)
+    data_start = len(header) + -len(header) % mmap.ALLOCATIONGRANULARITY  # Table starts page aligned
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.seek(data_start)
+        f.write(table)
+    os.replace(temp_path, path)
+
+
+class DistanceTable:
+    """
+    Exact distances to the goal for every state of a small board, from a memory-mapped file.
+
+    Goals with the blank in the same cell as the table's goal are handled by
+    renaming the tiles, so one table serves all of them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, dimension = struct.unpack_from(HEADER_FORMAT, self.data, 0)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"{path} is not a distance table file")
+        if version != TABLE_VERSION:
+            raise ValueError(f"{path} has version {version}, expected {TABLE_VERSION}")
+        self.dimension = dimension
+        self.num_cells = dimension * dimension
+        position = struct.calcsize(HEADER_FORMAT)
+        self.goal = list(self.data[position:position + self.num_cells])
+        position += self.num_cells
+        self.offset = position + -position % mmap.ALLOCATIONGRANULARITY
+
+    def renaming(self, goal):
+        """Map each tile of `goal` to the table goal's tile in the same cell, or None if impossible."""
+        goal = list(goal)
+        if goal.index(0) != self.goal.index(0):
+            return None
+        renamed = [0] * self.num_cells
+        for i, tile in enumerate(goal):
+            renamed[tile] = self.goal[i]
+        return renamed
+
+    def distance(self, state):
+        """Optimal solution length of a state (1D sequence) for the table's goal."""
+        return self.data[self.offset + solvable_index(state)]
+
+    def solve(self, state, goal=None):
+        """
+        Optimal moves from `state` to `goal`, walking down the table.
+
+        Every step takes a neighbour one move closer, so this costs at most
+        four lookups per move.
+        """
+        if goal is not None and list(goal) != self.goal:
+            renamed = self.renaming(goal)
+            if renamed is None:
+                raise ValueError("The distance table was built for a goal with the blank elsewhere")
+            state = [renamed[tile] for tile in state]
+        # solvable_index folds unsolvable states onto solvable ranks, so check first
+        if not solvability.is_solvable(state, self.goal, self.dimension):
+            raise ValueError("No solution found: the puzzle is not solvable")
+        board = MutableBoard(state, self.dimension)
+        remaining = self.distance(board.tiles)
+        moves = []
+        while remaining:
+            for move in board.successors():
+                if self.distance(board.tiles) == remaining - 1:
+                    break  # Keep this move
+            moves.append(move)
+            remaining -= 1
+        return moves
+
+    def close(self):
+        self.data.close()
+
+
+def default_path(dimension):
+    return os.path.join(TABLE_DIR, f"distances_{dimension}x{dimension}.bin")
+
+
+# Loaded tables, one per board dimension
+_tables = {}
+
+
+def load_distance_table(dimension=3, build=True):
+    """Load the default table for a board size, building it first (a few seconds for 3x3) if missing."""
+    if dimension not in _tables:
+        path = default_path(dimension)
+        if not os.path.exists(path):
+            if not build:
+                raise FileNotFoundError(path)
+            goal = list(range(1, dimension * dimension)) + [0]
+            save_distance_table(path, dimension, goal, build_distance_table(dimension, goal))
+        _tables[dimension] = DistanceTable(path)
+    return _tables[dimension]
+
+
+def tableSearch(puzzle, heuristic=None, max_nodes=None, deadline=None, progress=None):
+    """
+    Solve optimally by table lookups alone (boards up to MAX_TABLE_DIMENSION).
+
+    The heuristic and limits are accepted for interface compatibility with
+    the other engines; the lookups never come close to any limit.
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated"): one per step.
+    """
+    moves = load_distance_table(puzzle.dimension).solve(list(puzzle.state), list(puzzle.goal))
+    return moves, {"expanded": len(moves), "generated": len(moves) + 1}
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:] or ["3"]:
+        size = int(arg)
+        goal_state = list(range(1, size * size)) + [0]
+        save_distance_table(default_path(size), size, goal_state, build_distance_table(size, goal_state))
+        print(f"Wrote {default_path(size)}")
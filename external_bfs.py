@@ -0,0 +1,212 @@
+import heapq
+import json
+import os
+import sys
+
+from moves import neighbour_table
+from packed_state import MAX_BYTE_CELLS, MAX_NIBBLE_CELLS, pack, slide, unpack
+
+# States held in memory before a sorted run is written to disk
+DEFAULT_BUFFER_STATES = 1 << 20
+
+# Records read or written per I/O call
+IO_BLOCK_RECORDS = 1 << 14
+
+MANIFEST = "manifest.json"
+
+
+def record_size(cells):
+    """Bytes per state on disk: the nibble-packed key as 8 bytes, else one byte per tile."""
+    if cells <= MAX_NIBBLE_CELLS:
+        return 8
+    if cells <= MAX_BYTE_CELLS:
+        return cells
+    raise ValueError(f"external BFS supports boards of up to {MAX_BYTE_CELLS} cells")
+
+
+def encode(key):
+    """Packed key -> fixed-size record. Big-endian, so records sort like the keys."""
+    if isinstance(key, int):
+        return key.to_bytes(8, "big")
+    return key
+
+
+def decode(record):
+    if len(record) == 8:
+        return int.from_bytes(record, "big")
+    return record
+
+
+def layer_path(work_dir, depth):
+    return os.path.join(work_dir, f"layer_{depth:04d}.bin")
+
+
+def read_records(path, size):
+    """Stream the records of a file with large sequential reads."""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(size * IO_BLOCK_RECORDS)
+            if not block:
+                return
+            for i in range(0, len(block), size):
+                yield block[i:i + size]
+
+
+def iter_layer(work_dir, depth, cells):
+    """Packed keys of every state at `depth`, in sorted order."""
+    path = layer_path(work_dir, depth)
+    if not os.path.exists(path):
+        return
+    for record in read_records(path, record_size(cells)):
+        yield decode(record)
+
+
+class _RecordWriter:
+    """Buffered sequential writer that counts its records."""
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.buffer = bytearray()
+        self.count = 0
+
+    def write(self, record):
+        self.buffer += record
+        self.count += 1
+        if self.count % IO_BLOCK_RECORDS == 0:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+    def close(self):
+        self.file.write(self.buffer)
+        self.file.close()
+
+
+def _write_run(path, records):
+    """Sort a buffer, drop duplicates and write it as one run file."""
+    records.sort()
+    writer = _RecordWriter(path)
+    previous = None
+    for record in records:
+        if record != previous:
+            writer.write(record)
+            previous = record
+    writer.close()
+
+
+def _unique(records):
+    previous = None
+    for record in records:
+        if record != previous:
+            yield record
+            previous = record
+
+
+def _subtract(records, seen):
+    """Sorted records minus the sorted `seen` stream, in one linear pass over both."""
+    seen = iter(seen)
+    current = next(seen, None)
+    for record in records:
+        while current is not None and current < record:
+            current = next(seen, None)
+        if record != current:
+            yield record
+
+
+def external_bfs(start, dimension, work_dir, buffer_states=DEFAULT_BUFFER_STATES, max_depth=None, progress=None):
+    """
+    Breadth-first search from `start` that keeps its layers on disk.
+
+    Every layer is a file of sorted, fixed-size records. Expanding a layer
+    streams it from disk and collects children in a buffer of at most
+    buffer_states records. Each full buffer is sorted and written as a
+    run. The runs are then merged, and duplicates are dropped against the
+    previous two layers in the same sequential pass (delayed duplicate
+    detection). Moves are reversible, so a child is either new or in one
+    of those layers. Memory stays bounded by the buffer, however big the
+    layers get.
+
+    A manifest records every finished layer. Calling again with the same
+    work_dir and start resumes after the last finished layer.
+    Args:
+        start (sequence): The state to search from (e.g. the goal, to get distances to it).
+        dimension (int): The board dimension.
+        work_dir (str): Directory for the layer, run and manifest files.
+        buffer_states (int): Children held in memory before a run is written.
+        max_depth (int): Stop after this many layers (None: until the search space is exhausted).
+        progress (callable): Called after every layer with a dict of "depth", "states" and "runs".
+    Returns:
+        list: Number of states in every layer; layer d holds the states at distance d.
+    """
+    start = list(start)
+    cells = len(start)
+    size = record_size(cells)
+    os.makedirs(work_dir, exist_ok=True)
+    manifest_path = os.path.join(work_dir, MANIFEST)
+
+    manifest = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest["start"] != start or manifest["dimension"] != dimension:
+            raise ValueError(f"{work_dir} holds a search from another start state")
+    if manifest is None:
+        _write_run(layer_path(work_dir, 0), [encode(pack(start))])
+        manifest = {"dimension": dimension, "start": start, "layers": [1]}
+    # Anything not recorded in the manifest is left over from an interrupted layer
+    for name in os.listdir(work_dir):
+        if name.startswith("run_") or name.endswith(".tmp"):
+            os.remove(os.path.join(work_dir, name))
+
+    neighbours = neighbour_table(dimension)
+
+    while manifest["layers"][-1] and (max_depth is None or len(manifest["layers"]) <= max_depth):
+        depth = len(manifest["layers"]) - 1
+
+        # Expand the layer into sorted runs of at most buffer_states records
+        runs = []
+        buffer = []
+        for record in read_records(layer_path(work_dir, depth), size):
+            key = decode(record)
+            blank = unpack(key, cells).index(0)
+            for target, _ in neighbours[blank]:
+                buffer.append(encode(slide(key, blank, target)[0]))
+            if len(buffer) >= buffer_states:
+                runs.append(os.path.join(work_dir, f"run_{len(runs):05d}.bin"))
+                _write_run(runs[-1], buffer)
+                buffer = []
+        if buffer:
+            runs.append(os.path.join(work_dir, f"run_{len(runs):05d}.bin"))
+            _write_run(runs[-1], buffer)
+            buffer = []
+
+        # Merge the runs and drop states of the previous two layers
+        merged = _unique(heapq.merge(*(read_records(run, size) for run in runs)))
+        previous = [read_records(layer_path(work_dir, d), size) for d in (depth - 1, depth) if d >= 0]
+        temp_path = layer_path(work_dir, depth + 1) + ".tmp"
+        writer = _RecordWriter(temp_path)
+        for record in _subtract(merged, heapq.merge(*previous)):
+            writer.write(record)
+        writer.close()
+        os.replace(temp_path, layer_path(work_dir, depth + 1))
+        for run in runs:
+            os.remove(run)
+
+        manifest["layers"].append(writer.count)
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        if progress is not None:
+            progress({"depth": depth + 1, "states": writer.count, "runs": len(runs)})
+
+    layers = manifest["layers"]
+    return layers[:-1] if not layers[-1] else layers  # The search ends on an empty layer
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    directory = sys.argv[2] if len(sys.argv) > 2 else os.path.join("tables", f"bfs_{size}x{size}")
+    goal_state = list(range(1, size * size)) + [0]
+    counts = external_bfs(goal_state, size, directory,
+                          progress=lambda stats: print(f"depth {stats['depth']}: {stats['states']} states "
+                                                       f"({stats['runs']} runs)", flush=True))
+    print(f"{sum(counts)} states in {len(counts)} layers")
@@ -0,0 +1,111 @@
+from heapq import heappop, heappush
+
+# Frontier kinds accepted by the search engines (see make_frontier)
+FRONTIER_KINDS = ("auto", "bucket", "heap")
+
+
+class HeapFrontier:
+    """
+    Open list on a binary heap; works for any priority, including floats.
+
+    Entries are ordered by (priority, h), newest first on ties, so it
+    expands nodes in the same order as BucketFrontier.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, h, node):
+        # The negated counter breaks ties (LIFO), so nodes are never compared
+        self.counter += 1
+        heappush(self.heap, (priority, h, -self.counter, node))
+
+    def pop(self):
+        return heappop(self.heap)[3]
+
+    def min_priority(self):
+        return self.heap[0][0]
+
+
+class BucketFrontier:
+    """
+    Open list of buckets indexed by integer priority, then by h.
+
+    Unit move costs keep priorities small non-negative integers, so push is
+    a list append and pop is a list pop plus a short scan past empty
+    buckets, instead of O(log n) heap sifts with tuple comparisons. Ties
+    on priority go to the lowest h (closest to the goal) and then to the
+    newest node (LIFO), which finds the goal early within the last f layer.
+    """
+
+    def __init__(self):
+        self.buckets = []  # priority -> list of stacks indexed by h
+        self.counts = []  # priority -> number of nodes in that bucket
+        self.min_h = []  # priority -> lowest h that may hold nodes
+        self.min_bucket = 0  # No bucket below this one holds nodes
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, h, node):
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+            self.counts.append(0)
+            self.min_h.append(0)
+        stacks = self.buckets[priority]
+        while len(stacks) <= h:
+            stacks.append([])
+        stacks[h].append(node)
+        if self.counts[priority] == 0 or h < self.min_h[priority]:
+            self.min_h[priority] = h
+        self.counts[priority] += 1
+        self.size += 1
+        # Inconsistent heuristics can push below the current minimum
+        if priority < self.min_bucket:
+            self.min_bucket = priority
+
+    def min_priority(self):
+        if not self.size:
+            raise IndexError("min_priority from an empty frontier")
+        priority = self.min_bucket
+        while not self.counts[priority]:
+            priority += 1
+        self.min_bucket = priority
+        return priority
+
+    def pop(self):
+        priority = self.min_priority()
+        stacks = self.buckets[priority]
+        h = self.min_h[priority]
+        while not stacks[h]:
+            h += 1
+        self.min_h[priority] = h
+        self.counts[priority] -= 1
+        self.size -= 1
+        return stacks[h].pop()
+
+
+def make_frontier(kind="auto", integral=True):
+    """
+    Create an open list.
+
+    Args:
+        kind (str): "bucket", "heap", or "auto" to use buckets whenever the
+                    priorities are integers.
+        integral (bool): Whether every priority and h value will be a
+                         non-negative int.
+    Returns:
+        BucketFrontier or HeapFrontier
+    """
+    if kind not in FRONTIER_KINDS:
+        raise ValueError(f"Unknown frontier: {kind}")
+    if kind == "bucket" and not integral:
+        raise ValueError("the bucket frontier needs integer priorities (use frontier='heap')")
+    if kind == "heap" or not integral:
+        return HeapFrontier()
+    return BucketFrontier()
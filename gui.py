@@ -1,17 +1,33 @@
+import multiprocessing
+import queue
 import pygame
-from time import time
+from time import perf_counter
 from puzzle import N_Puzzle
 import puzzle
-from utils import solve_puzzle
-from heuristics import manhattan_heuristic, misplaced_tiles_heuristic, euclidean_heuristic, custom_heuristic
+from utils import solve_puzzle, solve_with_progress
+from heuristics import manhattan_heuristic, misplaced_tiles_heuristic, euclidean_heuristic
+from heuristics import linear_conflict_heuristic, walking_distance_heuristic
+from pattern_database import pattern_database_heuristic
+
+# Milliseconds between two moves when playing back a solution
+ANIMATION_DELAY = 250
+
+# Frame rate cap while solving or playing back; otherwise the loop sleeps until an event arrives
+FRAME_RATE = 30
+
+# Square area the board is scaled into, and the largest tile size (used up to 5x5)
+BOARD_PIXELS = 600
+MAX_TILE_SIZE = 100
 
 class PuzzleGUI:
     def __init__(self, puzzle=None, is_menu=False):
         pygame.init()
         self.width = 600
         self.height = 700
-        self.tile_size = 100
+        self.tile_size = MAX_TILE_SIZE
         self.margin = 5
+        self.layout_dimension = None
+        self.tile_surfaces = {}  # Pre-rendered tiles of the current layout
 
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("N-Puzzle")
@@ -22,6 +38,22 @@ class PuzzleGUI:
         self.is_choosing_heuristic = False  # Add this line
         self.running = True
 
+        # Background solve: worker process, its message queue and live stats
+        self.solver = None
+        self.messages = None
+        self.is_solving = False
+        self.solve_started = 0
+        self.progress = {}
+        self.cancel_rect = pygame.Rect(200, 600, 200, 60)
+
+        # Solution playback, then the results screen
+        self.solution = []
+        self.solution_step = 0
+        self.last_step_time = 0
+        self.is_animating = False
+        self.results = None
+        self.redraw = True  # Draw the whole screen on the next frame
+
         if not self.is_menu and self.puzzle is None:
             raise ValueError("A valid puzzle object must be provided if is_menu is False.")
     def draw_menu(self):
@@ -48,61 +80,134 @@ class PuzzleGUI:
 
     def draw_puzzle(self):
         self.screen.fill((255, 255, 255))  # Clear the screen
-        for i, tile in enumerate(self.puzzle.state):
-            if tile == 0:  # Skip the blank tile
-                continue
-            row, col = divmod(i, self.puzzle.dimension)
-            x = col * (self.tile_size + self.margin) + self.margin
-            y = row * (self.tile_size + self.margin) + self.margin
-            pygame.draw.rect(self.screen, (0, 0, 255), (x, y, self.tile_size, self.tile_size))
-            text = self.font.render(str(tile), True, (255, 255, 255))
-            text_rect = text.get_rect(center=(x + self.tile_size // 2, y + self.tile_size // 2))
-            self.screen.blit(text, text_rect)
+        self.draw_board()
         pygame.display.update()
 
+    def set_layout(self, dimension):
+        """Scale the tiles to fit the board area and pre-render every tile once."""
+        self.margin = max(1, min(5, BOARD_PIXELS // (dimension * 20)))
+        self.tile_size = min(MAX_TILE_SIZE, (BOARD_PIXELS - self.margin) // dimension - self.margin)
+        font = pygame.font.Font(None, max(12, self.tile_size // 2))
+        self.tile_surfaces = {}
+        for tile in range(1, dimension * dimension):
+            surface = pygame.Surface((self.tile_size, self.tile_size)).convert()
+            surface.fill((0, 0, 255))
+            text = font.render(str(tile), True, (255, 255, 255))
+            surface.blit(text, text.get_rect(center=(self.tile_size // 2, self.tile_size // 2)))
+            self.tile_surfaces[tile] = surface
+        self.layout_dimension = dimension
+
+    def cell_rect(self, index):
+        row, col = divmod(index, self.puzzle.dimension)
+        return pygame.Rect(col * (self.tile_size + self.margin) + self.margin,
+                           row * (self.tile_size + self.margin) + self.margin,
+                           self.tile_size, self.tile_size)
+
+    def draw_cell(self, index):
+        """Draw one cell (a tile or the blank) and return its rectangle."""
+        rect = self.cell_rect(index)
+        tile = self.puzzle.state[index]
+        if tile == 0:
+            self.screen.fill((255, 255, 255), rect)
+        else:
+            self.screen.blit(self.tile_surfaces[tile], rect)
+        return rect
+
+    def draw_board(self):
+        """Draw the tiles without updating the display."""
+        if self.layout_dimension != self.puzzle.dimension:
+            self.set_layout(self.puzzle.dimension)
+        for i, tile in enumerate(self.puzzle.state):
+            if tile:  # The screen was cleared, so the blank needs no drawing
+                self.draw_cell(i)
+
+    def move_tile(self, direction):
+        """Move the blank and update only the two cells that changed."""
+        blank = self.puzzle.state.index(0)
+        if self.puzzle.move(direction):
+            pygame.display.update([self.draw_cell(blank), self.draw_cell(self.puzzle.state.index(0))])
+
     def handle_click(self, mouse_pos):
         """Handle mouse click events for moving tiles."""
+        dimension = self.puzzle.dimension
         col, row = mouse_pos[0] // (self.tile_size + self.margin), mouse_pos[1] // (self.tile_size + self.margin)
-        clicked_index = row * self.dimension + col
+        if col >= dimension or row >= dimension:
+            return  # Below or beside the board
+        clicked_index = row * dimension + col
 
         zero_index = self.puzzle.state.index(0)
         possible_moves = self.puzzle.get_possible_moves()
 
-        if clicked_index == zero_index - self.dimension and "up" in possible_moves:
-            self.puzzle.move("up")
-        elif clicked_index == zero_index + self.dimension and "down" in possible_moves:
-            self.puzzle.move("down")
+        if clicked_index == zero_index - dimension and "up" in possible_moves:
+            self.move_tile("up")
+        elif clicked_index == zero_index + dimension and "down" in possible_moves:
+            self.move_tile("down")
         elif clicked_index == zero_index - 1 and "left" in possible_moves:
-            self.puzzle.move("left")
+            self.move_tile("left")
         elif clicked_index == zero_index + 1 and "right" in possible_moves:
-            self.puzzle.move("right")
+            self.move_tile("right")
         if self.puzzle.is_goal():
             self.display_success_message()
 
+    def current_screen(self):
+        """What is on screen; the loop redraws everything only when this changes."""
+        return (self.is_menu, self.is_choosing_heuristic, self.is_solving, self.is_animating,
+                self.results is not None, id(self.puzzle))
+
     def run(self):
         """Run the main loop of the GUI."""
+        clock = pygame.time.Clock()
+        drawn = None  # The screen shown right now
         running = True
         while running:
             if not pygame.get_init():  # Check if Pygame is initialized
                 break
 
-            self.screen.fill((255, 255, 255))  # Clear screen
-
-            if self.is_menu:
-                self.draw_menu()
-            elif self.is_choosing_heuristic:
-                self.choose_heuristic()  # Heuristic selection screen
+            if self.is_solving:
+                self.poll_solver()
+            screen = self.current_screen()
+            if self.is_solving:
+                self.draw_solving()  # Live search stats and the cancel button
+            elif self.is_animating:
+                if screen != drawn or self.redraw:
+                    self.draw_puzzle()
+                self.animate_solution()  # Redraws only the two tiles of each move
+            elif screen != drawn or self.redraw:
+                if self.is_menu:
+                    self.draw_menu()
+                elif self.is_choosing_heuristic:
+                    self.choose_heuristic()  # Heuristic selection screen
+                elif self.results is not None:
+                    self.display_results(*self.results)
+                else:
+                    self.draw_puzzle()  # Puzzle screen
+            drawn = screen
+            self.redraw = False
+
+            if not pygame.get_init():  # choose_heuristic quits Pygame when the window is closed
+                break
+            if self.is_solving or self.is_animating:
+                clock.tick(FRAME_RATE)
+                events = pygame.event.get()
             else:
-                self.draw_puzzle()  # Puzzle screen
-
-            pygame.display.update()
+                events = [pygame.event.wait()] + pygame.event.get()  # Idle: sleep until something happens
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.redraw = True
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     x, y = event.pos
-                    if self.is_menu:  # In the menu screen
+                    if self.is_solving:
+                        if self.cancel_rect.collidepoint(event.pos):
+                            self.cancel_solve()
+                    elif self.is_animating:
+                        pass  # Ignore clicks while the solution plays back
+                    elif self.results is not None:
+                        self.results = None  # Any click returns to the menu
+                        self.is_menu = True
+                    elif self.is_menu:  # In the menu screen
                         # Play Manually button
                         if 250 < y < 350:  # Play Manually button area
                             self.is_menu = False
@@ -129,6 +234,8 @@ class PuzzleGUI:
                         if self.puzzle.is_goal():
                             self.display_success_message()
 
+        if self.is_solving:
+            self.cancel_solve()
         pygame.quit()    # pygame.quit()  # Make sure the pygame window is quit at the end 
     
 
@@ -151,6 +258,7 @@ class PuzzleGUI:
         self.screen.blit(success_text, (self.width // 2 - success_text.get_width() // 2, self.height // 2))
         pygame.display.update()
         pygame.time.wait(3000)  # Pause for 3 seconds
+        self.redraw = True  # Bring the board back
 
     def choose_heuristic(self):
         """Display the screen to choose a heuristic function."""
@@ -164,8 +272,10 @@ class PuzzleGUI:
         heuristics = {
             "Misplaced Tiles": misplaced_tiles_heuristic,
             "Manhattan Distance": manhattan_heuristic,
-            "Linear Conflict": custom_heuristic,  # Replace with actual linear conflict if implemented
+            "Linear Conflict": linear_conflict_heuristic,
+            "Walking Distance": walking_distance_heuristic,
             "Euclidean Distance": euclidean_heuristic,
+            "Pattern Database": pattern_database_heuristic,
         }
 
         for i, heuristic_name in enumerate(heuristics.keys()):
@@ -176,7 +286,7 @@ class PuzzleGUI:
 
         heuristic_selected = False
         while not heuristic_selected:
-            for event in pygame.event.get():
+            for event in [pygame.event.wait()] + pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     return
@@ -188,11 +298,93 @@ class PuzzleGUI:
                             heuristic = heuristics[heuristic_name]
                             if self.puzzle is None:
                                 self.puzzle= N_Puzzle(size=3)
-                            time_taken, num_moves = solve_puzzle(self.puzzle, heuristic)
-                            print(f"Time Taken: {time_taken} seconds, Moves: {num_moves}")
-                            self.display_results(heuristic_name, time_taken, num_moves)
+                            self.start_solve(heuristic_name, heuristic)
                             return
 
+    def start_solve(self, heuristic_name, heuristic, algorithm="astar"):
+        """Start solving the current puzzle in a background process."""
+        # spawn rather than fork: the child must not inherit pygame's state
+        context = multiprocessing.get_context("spawn")
+        self.messages = context.Queue()
+        self.solver = context.Process(
+            target=solve_with_progress,
+            args=(list(self.puzzle.state), list(self.puzzle.goal), self.puzzle.dimension,
+                  heuristic, algorithm, self.messages),
+            daemon=True)
+        self.solver.start()
+        self.selected_heuristic = heuristic_name
+        self.solve_started = perf_counter()
+        self.progress = {}
+        self.is_choosing_heuristic = False
+        self.is_solving = True
+
+    def poll_solver(self):
+        """Read every pending message from the solver without blocking."""
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                return
+            if message[0] == "progress":
+                self.progress = message[1]
+            elif message[0] == "done":
+                _, moves, stats, time_taken = message
+                print(f"Time Taken: {time_taken} seconds, Moves: {len(moves)}, "
+                      f"Expanded: {stats['expanded']}, Generated: {stats['generated']}")
+                self.finish_solve()
+                self.results = (self.selected_heuristic, time_taken, len(moves))
+                self.solution = moves
+                self.solution_step = 0
+                self.is_animating = True
+                return
+            else:
+                print(f"Solver failed: {message[1]}")
+                self.finish_solve()
+                self.is_menu = True
+                return
+
+    def finish_solve(self):
+        self.solver.join()
+        self.solver = None
+        self.messages = None
+        self.is_solving = False
+
+    def cancel_solve(self):
+        """Stop the background search and go back to the menu."""
+        self.solver.terminate()
+        self.finish_solve()
+        self.is_menu = True
+
+    def draw_solving(self):
+        """Show the puzzle with live search statistics and a cancel button."""
+        self.screen.fill((255, 255, 255))
+        self.draw_board()
+        elapsed = perf_counter() - self.solve_started
+        expanded = self.progress.get("expanded", 0)
+        lines = [
+            f"Solving... {elapsed:.1f}s",
+            f"Nodes/sec: {expanded / elapsed if elapsed > 0 else 0:,.0f}",
+            f"Frontier: {self.progress.get('frontier', 0):,}",
+        ]
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, (0, 0, 0))
+            self.screen.blit(text, (self.width // 2 - text.get_width() // 2, 400 + i * 50))
+        pygame.draw.rect(self.screen, (200, 0, 0), self.cancel_rect)
+        cancel_text = self.font.render("Cancel", True, (255, 255, 255))
+        self.screen.blit(cancel_text, cancel_text.get_rect(center=self.cancel_rect.center))
+        pygame.display.update()
+
+    def animate_solution(self):
+        """Play back the solution one move every ANIMATION_DELAY milliseconds."""
+        now = pygame.time.get_ticks()
+        if now - self.last_step_time >= ANIMATION_DELAY:
+            self.last_step_time = now
+            if self.solution_step < len(self.solution):
+                self.move_tile(self.solution[self.solution_step])
+                self.solution_step += 1
+            else:
+                self.is_animating = False  # Show the results next
+
     def solve_with_heuristic(self, heuristics, heuristic_name):
         """Solve the puzzle using the selected heuristic."""
         self.screen.fill((255, 255, 255))  # Clear screen
@@ -200,7 +392,7 @@ class PuzzleGUI:
         heuristic = getattr(__import__('heuristics'), heuristic_func)
 
         self.puzzle = N_Puzzle(size=3)  # Generate random puzzle of size 3 (8-puzzle)
-        time_taken, num_moves = solve_puzzle(self.puzzle, heuristic)
+        time_taken, num_moves, _, _ = solve_puzzle(self.puzzle, heuristic)
 
         
     def display_results(self, heuristic_name, time_taken, num_moves):
@@ -213,7 +405,9 @@ class PuzzleGUI:
         moves_text = self.font.render(f"Moves: {num_moves}", True, (0, 0, 0))
         self.screen.blit(moves_text, (self.width // 2 - moves_text.get_width() // 2, 400))
 
+        hint_text = self.font.render("Click to continue", True, (128, 128, 128))
+        self.screen.blit(hint_text, (self.width // 2 - hint_text.get_width() // 2, 500))
+
         pygame.display.update()
-        pygame.time.wait(5000)  # Wait for 5 seconds before returning to the menu
 
 
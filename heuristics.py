@@ -1,44 +1,248 @@
-# from puzzle import N_Puzzle
+from functools import lru_cache
+from pattern_database import load_pattern_database, pattern_database_heuristic
+
+# How many (dimension, goal) distance tables to keep around at once
+GOAL_TABLE_CACHE_SIZE = 16
+
+class GoalTables:
+    """Distance tables for one (dimension, goal) pair, indexed as table[tile][index]."""
+
+    def __init__(self, dimension, goal):
+        self.dimension = dimension
+        self.goal = goal
+        cells = len(goal)
+        self.goal_index = [0] * cells  # tile -> goal index
+        for i, tile in enumerate(goal):
+            self.goal_index[tile] = i
+        self.goal_row = [i // dimension for i in self.goal_index]
+        self.goal_col = [i % dimension for i in self.goal_index]
+
+        self.misplaced = [[0] * cells for _ in range(cells)]
+        self.manhattan = [[0] * cells for _ in range(cells)]
+        self.euclidean = [[0] * cells for _ in range(cells)]
+        self.custom = [[0] * cells for _ in range(cells)]
+        for tile in range(1, cells):  # The blank never contributes
+            goal_row, goal_col = self.goal_row[tile], self.goal_col[tile]
+            for i in range(cells):
+                curr_row, curr_col = divmod(i, dimension)
+                self.misplaced[tile][i] = 0 if i == self.goal_index[tile] else 1
+                self.manhattan[tile][i] = abs(goal_row - curr_row) + abs(goal_col - curr_col)
+                self.euclidean[tile][i] = ((goal_row - curr_row) ** 2 + (goal_col - curr_col) ** 2) ** 0.5
+                self.custom[tile][i] = self.manhattan[tile][i] * 2
+
+@lru_cache(maxsize=GOAL_TABLE_CACHE_SIZE)
+def goal_tables(dimension, goal):
+    """Build (or fetch from the LRU cache) the GoalTables for a goal tuple."""
+    return GoalTables(dimension, goal)
+
+class HeuristicContext:
+    """
+    The minimum a heuristic needs: state, goal, dimension and the goal tables.
+
+    Search engines keep one context per search and only swap `state`, so
+    heuristics never rebuild the goal index for every node.
+    """
+
+    def __init__(self, dimension, goal, state=None):
+        self.dimension = dimension
+        self.goal = tuple(goal)
+        self.tables = goal_tables(dimension, self.goal)
+        self.state = state
+
+def get_tables(puzzle):
+    """Goal tables for a HeuristicContext or any puzzle-like object."""
+    tables = getattr(puzzle, "tables", None)
+    if tables is None:
+        tables = goal_tables(puzzle.dimension, tuple(puzzle.goal))
+    return tables
+
 def misplaced_tiles_heuristic(puzzle):
     """Heuristic: Number of misplaced tiles."""
-    misplaced = 0
-    for i in range(len(puzzle.state)):
-        if puzzle.state[i] != 0 and puzzle.state[i] != puzzle.goal[i]:
-            misplaced += 1
-    return misplaced
+    table = get_tables(puzzle).misplaced
+    return sum(table[tile][i] for i, tile in enumerate(puzzle.state))
 
 def manhattan_heuristic(puzzle):
     """Heuristic: Sum of Manhattan distances of tiles from their goal positions."""
-    distance = 0
-    for i in range(len(puzzle.state)):
-        if puzzle.state[i] == 0:
-            continue
-        goal_index = puzzle.goal.index(puzzle.state[i])
-        goal_row, goal_col = divmod(goal_index, puzzle.dimension)
-        curr_row, curr_col = divmod(i, puzzle.dimension)
-        distance += abs(goal_row - curr_row) + abs(goal_col - curr_col)
-    return distance
+    table = get_tables(puzzle).manhattan
+    return sum(table[tile][i] for i, tile in enumerate(puzzle.state))
 
 def euclidean_heuristic(puzzle):
     """Heuristic: Sum of Euclidean distances of tiles from their goal positions."""
-    distance = 0
-    for i in range(len(puzzle.state)):
-        if puzzle.state[i] == 0:
-            continue
-        goal_index = puzzle.goal.index(puzzle.state[i])
-        goal_row, goal_col = divmod(goal_index, puzzle.dimension)
-        curr_row, curr_col = divmod(i, puzzle.dimension)
-        distance += ((goal_row - curr_row) * 2 + (goal_col - curr_col) * 2) ** 0.5
-    return distance
+    table = get_tables(puzzle).euclidean
+    return sum(table[tile][i] for i, tile in enumerate(puzzle.state))
 
 def custom_heuristic(puzzle):
     """Heuristic: A custom heuristic (example: sum of row and column distances)."""
+    table = get_tables(puzzle).custom
+    return sum(table[tile][i] for i, tile in enumerate(puzzle.state))
+
+# Conflict tables, one per board dimension. A line (row or column) is encoded
+# as a base-(dimension + 1) number with one digit per cell: the goal slot of
+# the tile within this line, or `dimension` if the tile belongs elsewhere.
+_line_conflict_tables = {}
+
+def line_conflict_table(dimension):
+    """
+    Extra moves caused by linear conflicts for every encoded line.
+
+    Tiles that sit in their goal line but in the wrong order must partly
+    leave the line; the fewest tiles to move out is the line length minus
+    the longest increasing run of goal slots, and each costs two moves.
+    """
+    if dimension not in _line_conflict_tables:
+        base = dimension + 1
+        table = bytearray(base ** dimension)
+        for code in range(len(table)):
+            slots = []
+            value = code
+            for _ in range(dimension):
+                value, digit = divmod(value, base)
+                if digit != dimension:
+                    slots.append(digit)
+            # Longest strictly increasing subsequence of the goal slots
+            longest = [1] * len(slots)
+            for i in range(len(slots)):
+                for j in range(i):
+                    if slots[j] < slots[i] and longest[j] + 1 > longest[i]:
+                        longest[i] = longest[j] + 1
+            table[code] = 2 * (len(slots) - max(longest, default=0))
+        _line_conflict_tables[dimension] = table
+    return _line_conflict_tables[dimension]
+
+def linear_conflict_heuristic(puzzle):
+    """Heuristic: Manhattan distance plus two moves per tile removed to resolve row/column conflicts."""
+    dimension = puzzle.dimension
+    base = dimension + 1
+    table = line_conflict_table(dimension)
+    tables = get_tables(puzzle)
+    goal_row, goal_col = tables.goal_row, tables.goal_col
+    row_codes = [0] * dimension
+    col_codes = [0] * dimension
     distance = 0
-    for i in range(len(puzzle.state)):
-        if puzzle.state[i] == 0:
+    for i, tile in enumerate(puzzle.state):
+        curr_row, curr_col = divmod(i, dimension)
+        if tile == 0:
+            row_codes[curr_row] += dimension * base ** curr_col
+            col_codes[curr_col] += dimension * base ** curr_row
+            continue
+        distance += tables.manhattan[tile][i]
+        row_codes[curr_row] += (goal_col[tile] if goal_row[tile] == curr_row else dimension) * base ** curr_col
+        col_codes[curr_col] += (goal_row[tile] if goal_col[tile] == curr_col else dimension) * base ** curr_row
+    return distance + sum(table[code] for code in row_codes) + sum(table[code] for code in col_codes)
+
+# Walking distance tables keyed by (dimension, goal line of the blank)
+_walking_distance_tables = {}
+
+def walking_distance_table(dimension, blank_line):
+    """
+    Breadth-first distances over the walking-distance abstraction.
+
+    An abstract state records, for each line, how many tiles belonging to
+    each goal line it holds, plus the line of the blank. A move swaps the
+    blank with any tile of an adjacent line.
+
+    Returns:
+        dict: Abstract state (tuple of counts + blank line) -> moves to the goal.
+    """
+    key = (dimension, blank_line)
+    if key not in _walking_distance_tables:
+        counts = [0] * (dimension * dimension)
+        for line in range(dimension):
+            counts[line * dimension + line] = dimension - (1 if line == blank_line else 0)
+        start = tuple(counts) + (blank_line,)
+        distances = {start: 0}
+        layer = [start]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for abstract in layer:
+                blank = abstract[-1]
+                for line in (blank - 1, blank + 1):
+                    if not 0 <= line < dimension:
+                        continue
+                    for goal_line in range(dimension):
+                        if abstract[line * dimension + goal_line] == 0:
+                            continue
+                        child = list(abstract)
+                        child[line * dimension + goal_line] -= 1
+                        child[blank * dimension + goal_line] += 1
+                        child[-1] = line
+                        child = tuple(child)
+                        if child not in distances:
+                            distances[child] = depth
+                            next_layer.append(child)
+            layer = next_layer
+        _walking_distance_tables[key] = distances
+    return _walking_distance_tables[key]
+
+def walking_distance_heuristic(puzzle):
+    """Heuristic: Vertical plus horizontal walking distance."""
+    dimension = puzzle.dimension
+    tables = get_tables(puzzle)
+    blank_row, blank_col = tables.goal_row[0], tables.goal_col[0]
+    rows = [0] * (dimension * dimension + 1)
+    cols = [0] * (dimension * dimension + 1)
+    for i, tile in enumerate(puzzle.state):
+        curr_row, curr_col = divmod(i, dimension)
+        if tile == 0:
+            rows[-1], cols[-1] = curr_row, curr_col
             continue
-        goal_index = puzzle.goal.index(puzzle.state[i])
-        goal_row, goal_col = divmod(goal_index, puzzle.dimension)
-        curr_row, curr_col = divmod(i, puzzle.dimension)
-        distance += (abs(goal_row - curr_row) + abs(goal_col - curr_col)) * 2  # Custom formula
-    return distance
\ No newline at end of file
+        rows[curr_row * dimension + tables.goal_row[tile]] += 1
+        cols[curr_col * dimension + tables.goal_col[tile]] += 1
+    return (walking_distance_table(dimension, blank_row)[tuple(rows)]
+            + walking_distance_table(dimension, blank_col)[tuple(cols)])
+
+# Heuristics that are a plain sum over tiles, and the GoalTables attribute
+# holding their per-tile costs. Searches use these to update h in O(1).
+TILE_COSTS = {
+    misplaced_tiles_heuristic: "misplaced",
+    manhattan_heuristic: "manhattan",
+    euclidean_heuristic: "euclidean",
+    custom_heuristic: "custom",
+}
+
+def tile_cost_table(heuristic, dimension, goal):
+    """
+    Return the table costs[tile][index] for heuristics that are a plain sum over tiles.
+
+    Parameters:
+        heuristic: One of the heuristic functions in this module.
+        dimension (int): The dimension of the puzzle.
+        goal (list): The goal state as a 1D list.
+
+    Returns:
+        list or None: The cost table, or None if the heuristic is not separable per tile.
+    """
+    name = TILE_COSTS.get(heuristic)
+    if name is None:
+        return None
+    return getattr(goal_tables(dimension, tuple(goal)), name)
+
+# Heuristics by name, for the command line and batch tools
+HEURISTICS = {
+    "misplaced": misplaced_tiles_heuristic,
+    "manhattan": manhattan_heuristic,
+    "euclidean": euclidean_heuristic,
+    "custom": custom_heuristic,
+    "linear_conflict": linear_conflict_heuristic,
+    "walking_distance": walking_distance_heuristic,
+    "pattern_database": pattern_database_heuristic,
+}
+
+def warm_tables(heuristic, dimension, goal=None):
+    """
+    Build the lookup tables a heuristic needs for one board size ahead of time.
+
+    Call it before forking worker processes so they inherit the tables
+    instead of each building its own copy.
+    """
+    goal = tuple(goal) if goal else tuple(range(1, dimension * dimension)) + (0,)
+    tables = goal_tables(dimension, goal)
+    if heuristic is linear_conflict_heuristic:
+        line_conflict_table(dimension)
+    elif heuristic is walking_distance_heuristic:
+        walking_distance_table(dimension, tables.goal_row[0])
+        walking_distance_table(dimension, tables.goal_col[0])
+    elif heuristic is pattern_database_heuristic:
+        load_pattern_database(dimension)
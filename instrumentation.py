@@ -0,0 +1,151 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from time import perf_counter
+
+
+class Instrumentation:
+    """
+    Opt-in counters, timings and profiling for one search.
+
+    Pass it as search(..., instrument=Instrumentation()). Engines with hooks
+    (best-first, IDA*, bidirectional, anytime) report every expansion; for
+    the others the totals come from the returned stats. Without an
+    instrument the engines only pay an `is not None` check per node.
+
+    Layers group expansions by a key the engine chooses: the f value for
+    best-first search, the threshold for IDA*, the weight of each anytime
+    pass and the (side, depth) of bidirectional BFS.
+    Args:
+        callback (callable): Called with snapshot() every `interval` expansions.
+        interval (int): Expansions between callbacks.
+        profile (bool): Run the search under cProfile (see profile_report).
+        sample_interval (float): Seconds between stack samples of the
+                                 searching thread, or None for no sampling.
+    """
+
+    def __init__(self, callback=None, interval=10000, profile=False, sample_interval=None):
+        self.callback = callback
+        self.interval = interval
+        self.profile = profile
+        self.sample_interval = sample_interval
+
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.wall_time = 0.0
+        self.layers = {}  # layer key -> {"expanded", "generated", "time"}
+        self.stats = None  # pstats.Stats once a profiled search finishes
+        self.samples = Counter()  # "file:function" -> samples
+
+        self._layer = None
+        self._layer_start = (0, 0, 0.0)  # expanded, generated, time when the current layer began
+
+    def wrap_evaluate(self, evaluate):
+        """Count and time every full heuristic evaluation (incremental updates are not calls)."""
+        def timed_evaluate(state):
+            start = perf_counter()
+            value = evaluate(state)
+            self.heuristic_time += perf_counter() - start
+            self.heuristic_calls += 1
+            return value
+        return timed_evaluate
+
+    def expand(self, layer, open_size, closed_size, expanded, generated):
+        """Called by the engines for every expanded node."""
+        if open_size > self.peak_open:
+            self.peak_open = open_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        if layer != self._layer:
+            self._close_layer(expanded - 1, generated)
+            self._layer = layer
+        self.expanded, self.generated = expanded, generated
+        if self.callback is not None and expanded % self.interval == 0:
+            self.callback(self.snapshot())
+
+    def _close_layer(self, expanded, generated):
+        now = perf_counter()
+        start_expanded, start_generated, start_time = self._layer_start
+        if self._layer is not None:
+            totals = self.layers.setdefault(self._layer, {"expanded": 0, "generated": 0, "time": 0.0})
+            totals["expanded"] += expanded - start_expanded
+            totals["generated"] += generated - start_generated
+            totals["time"] += now - start_time
+        self._layer_start = (expanded, generated, now)
+
+    def run(self, function, *args, **kwargs):
+        """Run a search under the requested profiler/sampler and time it."""
+        profiler = cProfile.Profile() if self.profile else None
+        stop = threading.Event()
+        sampler = None
+        if self.sample_interval:
+            sampler = threading.Thread(target=self._sample, args=(threading.get_ident(), stop), daemon=True)
+            sampler.start()
+        self._layer_start = (0, 0, perf_counter())
+        start = perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.stats = pstats.Stats(profiler)
+            self.wall_time = perf_counter() - start
+            stop.set()
+            if sampler is not None:
+                sampler.join()
+            self._close_layer(self.expanded, self.generated)
+            self._layer = None
+
+    def _sample(self, thread_id, stop):
+        while not stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                code = frame.f_code
+                self.samples[f"{os.path.basename(code.co_filename)}:{code.co_name}"] += 1
+
+    def finish(self, stats):
+        """Take the totals from an engine's returned stats."""
+        self.expanded = stats.get("expanded", self.expanded)
+        self.generated = stats.get("generated", self.generated)
+        self.duplicates = stats.get("duplicates", self.duplicates)
+
+    def snapshot(self):
+        """The counters so far as a JSON-friendly dict."""
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "heuristic_calls": self.heuristic_calls,
+            "heuristic_time": self.heuristic_time,
+            "peak_open": self.peak_open,
+            "peak_closed": self.peak_closed,
+            "wall_time": self.wall_time,
+        }
+
+    def as_dict(self):
+        """Everything recorded, including per-layer stats and the top samples."""
+        report = self.snapshot()
+        report["layers"] = [dict(key=key, **totals) for key, totals in self.layers.items()]
+        if self.samples:
+            report["samples"] = dict(self.samples.most_common(20))
+        return report
+
+    def profile_report(self, limit=20, sort="cumulative"):
+        """The profiler's top functions as text ("" if the search was not profiled)."""
+        if self.stats is None:
+            return ""
+        out = io.StringIO()
+        self.stats.stream = out
+        self.stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
@@ -1,14 +1,20 @@
-from puzzle import N_Puzzle
+import sys
+
 # from heuristics import Heuristics
-from gui import PuzzleGUI
 # from utils import solve_puzzle
 # import pygame
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Any arguments: solve headless (see solve.py) without loading pygame
+        from solve import main as solve_main
+        return solve_main(argv)
+    from gui import PuzzleGUI  # Imported here: only the GUI needs pygame and a display
     # Create a temporary dummy puzzle object for the menu
     # dummy_puzzle = Puzzle(size=8)  # Default 8-puzzle
     menu_gui = PuzzleGUI(is_menu=True)  # Pass the dummy puzzle
     menu_gui.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import random
+from functools import lru_cache
+
+# Blank moves as (row_offset, col_offset)
+MOVE_OFFSETS = {
+    "up": (-1, 0),
+    "down": (1, 0),
+    "left": (0, -1),
+    "right": (0, 1)
+}
+
+# The move that undoes each move
+OPPOSITE_MOVES = {
+    "up": "down",
+    "down": "up",
+    "left": "right",
+    "right": "left"
+}
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(dimension):
+    """
+    Legal blank moves for every blank cell, built once per board size.
+
+    Returns:
+        tuple: For each blank index, a tuple of (target index, move) pairs in
+               MOVE_OFFSETS order; the tile at the target slides into the blank.
+    """
+    table = []
+    for blank in range(dimension * dimension):
+        row, col = divmod(blank, dimension)
+        table.append(tuple((blank + row_offset * dimension + col_offset, move)
+                           for move, (row_offset, col_offset) in MOVE_OFFSETS.items()
+                           if 0 <= row + row_offset < dimension and 0 <= col + col_offset < dimension))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def move_targets(dimension):
+    """For each blank index, a dict of legal move -> target index (see neighbour_table)."""
+    return tuple({move: target for target, move in moves} for moves in neighbour_table(dimension))
+
+
+@lru_cache(maxsize=None)
+def zobrist_table(dimension):
+    """
+    Random 64-bit keys, zobrist[tile][cell], for hashing boards of one size.
+
+    The blank's keys are all 0, so a move changes the hash by the moved
+    tile's keys alone. The seed is fixed, so hashes are reproducible.
+    """
+    cells = dimension * dimension
+    rng = random.Random(cells)
+    return tuple(tuple(0 for _ in range(cells)) if tile == 0 else tuple(rng.getrandbits(64) for _ in range(cells))
+                 for tile in range(cells))
+
+
+def zobrist_hash(tiles, dimension):
+    """Zobrist hash of a whole board: the XOR of every tile's key at its cell."""
+    zobrist = zobrist_table(dimension)
+    value = 0
+    for cell, tile in enumerate(tiles):
+        value ^= zobrist[tile][cell]
+    return value
+
+
+class MutableBoard:
+    """
+    A board changed in place, for depth-first searches.
+
+    The blank position and a Zobrist hash are kept up to date on every
+    move, so neither needs a scan of the board. Moving the blank back to
+    where it came from undoes a move exactly, hash included.
+    """
+
+    __slots__ = ("tiles", "dimension", "blank", "hash", "neighbours", "zobrist")
+
+    def __init__(self, tiles, dimension):
+        self.tiles = list(tiles)
+        self.dimension = dimension
+        self.blank = self.tiles.index(0)
+        self.hash = zobrist_hash(self.tiles, dimension)
+        self.neighbours = neighbour_table(dimension)
+        self.zobrist = zobrist_table(dimension)
+
+    def move_to(self, target):
+        """Slide the tile at target (next to the blank) into the blank and return that tile."""
+        tiles = self.tiles
+        blank = self.blank
+        tile = tiles[target]
+        tiles[blank] = tile
+        tiles[target] = 0
+        keys = self.zobrist[tile]
+        self.hash ^= keys[target] ^ keys[blank]
+        self.blank = target
+        return tile
+
+    def successors(self, exclude=None):
+        """
+        Yield each legal move with the board moved, undoing it when resumed.
+
+        The board itself is the successor: read it (tiles, blank, hash)
+        before asking for the next one. Nothing is copied per child.
+        Leaving the loop early (break) keeps the current move.
+        Args:
+            exclude (int): A target cell to skip, e.g. the previous blank
+                           cell, so the last move is not undone.
+        Yields:
+            str: The move applied.
+        """
+        blank = self.blank
+        for target, move in self.neighbours[blank]:
+            if target == exclude:
+                continue
+            self.move_to(target)
+            yield move
+            self.move_to(blank)
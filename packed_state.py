@@ -0,0 +1,129 @@
+# Boards up to this many cells are packed 4 bits per tile into one int
+MAX_NIBBLE_CELLS = 16
+
+# Boards up to this many cells (15x15) are packed one byte per tile
+MAX_BYTE_CELLS = 256
+
+
+def pack(tiles):
+    """
+    Pack a sequence of tiles into a compact, hashable key.
+
+    Boards of up to 4x4 become a single int with tile i in bits 4*i .. 4*i+3;
+    larger boards become a bytes object with one byte per tile, and boards
+    whose tiles do not fit in a byte a tuple of tiles.
+    """
+    tiles = list(tiles)
+    if len(tiles) <= MAX_NIBBLE_CELLS:
+        key = 0
+        for i, tile in enumerate(tiles):
+            key |= tile << (i << 2)
+        return key
+    if len(tiles) <= MAX_BYTE_CELLS:
+        return bytes(tiles)
+    return tuple(tiles)
+
+
+def unpack(key, cells):
+    """Inverse of pack: return the tiles as a list."""
+    if isinstance(key, int):
+        return [(key >> (i << 2)) & 15 for i in range(cells)]
+    return list(key)
+
+
+def tile_at(key, index):
+    """The tile stored at `index` of a packed key."""
+    if isinstance(key, int):
+        return (key >> (index << 2)) & 15
+    return key[index]
+
+
+def slide(key, blank, target):
+    """
+    Move the tile at `target` into the blank at `blank`.
+
+    Returns:
+        new_key: The packed key of the resulting state.
+        tile (int): The tile that moved.
+    """
+    if isinstance(key, int):
+        shift = target << 2
+        tile = (key >> shift) & 15
+        # The blank nibble is zero, so the swap is a subtract and an add
+        return key - (tile << shift) + (tile << (blank << 2)), tile
+    if isinstance(key, bytes):
+        tiles = bytearray(key)
+        tile = tiles[target]
+        tiles[blank], tiles[target] = tile, 0
+        return bytes(tiles), tile
+    tiles = list(key)
+    tile = tiles[target]
+    tiles[blank], tiles[target] = tile, 0
+    return tuple(tiles), tile
+
+
+class PackedState:
+    """
+    An immutable puzzle state stored as a packed key with a cached blank position.
+
+    It behaves like a read-only sequence of tiles (indexing, iteration, len,
+    index) and compares equal to lists or tuples holding the same tiles.
+    """
+
+    __slots__ = ("key", "cells", "blank")
+
+    def __init__(self, tiles):
+        if isinstance(tiles, PackedState):
+            self.key, self.cells, self.blank = tiles.key, tiles.cells, tiles.blank
+            return
+        tiles = list(tiles)
+        self.key = pack(tiles)
+        self.cells = len(tiles)
+        self.blank = tiles.index(0)
+
+    @classmethod
+    def from_key(cls, key, cells, blank):
+        state = cls.__new__(cls)
+        state.key, state.cells, state.blank = key, cells, blank
+        return state
+
+    def slide(self, target):
+        """Return the state after moving the tile at `target` into the blank."""
+        key, _ = slide(self.key, self.blank, target)
+        return PackedState.from_key(key, self.cells, target)
+
+    def tolist(self):
+        return unpack(self.key, self.cells)
+
+    def index(self, tile):
+        if tile == 0:
+            return self.blank
+        return self.tolist().index(tile)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        if index < 0:
+            index += self.cells
+        if not 0 <= index < self.cells:
+            raise IndexError("state index out of range")
+        return tile_at(self.key, index)
+
+    def __len__(self):
+        return self.cells
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        if isinstance(other, PackedState):
+            return self.key == other.key and self.cells == other.cells
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PackedState({self.tolist()})"
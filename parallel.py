@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from moves import OPPOSITE_MOVES, neighbour_table
+from utils import SearchLimitReached, make_evaluator
+
+# Root subtrees handed out per worker in every threshold iteration. More
+# subtrees than workers keeps the load balanced when subtree sizes differ.
+SUBTREES_PER_WORKER = 8
+
+# Workers look at the cancel flag (and the clock) every this many nodes
+CHECK_INTERVAL = 1024
+
+# Per-process search setup, filled in by _init_worker
+_worker = {}
+
+
+def _children(state, zero_index, previous_move, dimension):
+    """Yield (move, new_zero_index) for every move except the one undoing previous_move."""
+    undo = OPPOSITE_MOVES.get(previous_move)
+    for new_zero_index, move in neighbour_table(dimension)[zero_index]:
+        if move != undo:
+            yield move, new_zero_index
+
+
+def _init_worker(heuristic, dimension, goal, cancel_event):
+    evaluate, costs = make_evaluator(heuristic, dimension, goal)
+    _worker.update(evaluate=evaluate, costs=costs, dimension=dimension, goal=list(goal), cancel=cancel_event)
+
+
+def _search_subtree(state, zero_index, g, previous_move, bound, deadline):
+    """
+    Depth-first search of one root subtree up to the current threshold.
+
+    Returns:
+        moves (list or None): Moves from the subtree root to the goal, if found.
+        next_bound (float): Smallest f above the threshold seen in the subtree.
+        expanded (int), generated (int): Search counters.
+    """
+    evaluate, costs = _worker["evaluate"], _worker["costs"]
+    dimension, goal_state, cancel = _worker["dimension"], _worker["goal"], _worker["cancel"]
+    path = []
+    expanded = 0
+    generated = 0
+
+    def dfs(g, h, zero_index, previous_move):
+        nonlocal expanded, generated
+        f = g + h
+        if f > bound:
+            return f
+        if state == goal_state:
+            return None
+        expanded += 1
+        if expanded % CHECK_INTERVAL == 0:
+            if cancel.is_set():
+                return float("inf")  # Another worker already found the solution
+            if deadline is not None and time.time() > deadline:
+                raise SearchLimitReached("timeout", expanded)
+
+        children = []
+        for move, new_zero_index in _children(state, zero_index, previous_move, dimension):
+            tile = state[new_zero_index]
+            if costs is not None:
+                new_h = h - costs[tile][new_zero_index] + costs[tile][zero_index]
+            else:
+                state[zero_index], state[new_zero_index] = tile, 0
+                new_h = evaluate(state)
+                state[zero_index], state[new_zero_index] = 0, tile
+            children.append((new_h, move, new_zero_index))
+        children.sort(key=lambda child: child[0])
+        generated += len(children)
+
+        next_bound = float("inf")
+        for new_h, move, new_zero_index in children:
+            tile = state[new_zero_index]
+            state[zero_index], state[new_zero_index] = tile, 0  # Move
+            path.append(move)
+            result = dfs(g + 1, new_h, new_zero_index, move)
+            if result is None:
+                return None
+            path.pop()
+            state[zero_index], state[new_zero_index] = 0, tile  # Undo
+            next_bound = min(next_bound, result)
+        return next_bound
+
+    if cancel.is_set():
+        return None, float("inf"), 0, 0
+    result = dfs(g, evaluate(state), zero_index, previous_move)
+    if result is None:
+        return path, bound, expanded, generated
+    return None, result, expanded, generated
+
+
+def _split_root(state, evaluate, dimension, goal_state, bound, wanted):
+    """
+    Expand the top of the search tree breadth-first until it has `wanted` subtrees.
+
+    Returns:
+        moves (list or None): A solution if one lies within the expanded top.
+        roots (list): (moves, state, zero_index, g) of every subtree within the bound.
+        next_bound (float): Smallest f above the bound among the pruned nodes.
+    """
+    next_bound = float("inf")
+    layer = [([], state, state.index(0))]
+    depth = 0
+    while layer and len(layer) < wanted:
+        next_layer = []
+        for moves, node, zero_index in layer:
+            if node == goal_state:
+                return moves, [], bound
+            previous_move = moves[-1] if moves else None
+            for move, new_zero_index in _children(node, zero_index, previous_move, dimension):
+                child = node[:]
+                child[zero_index], child[new_zero_index] = child[new_zero_index], 0
+                f = depth + 1 + evaluate(child)
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
+                next_layer.append((moves + [move], child, new_zero_index))
+        layer = next_layer
+        depth += 1
+    return None, [(moves, node, zero_index, depth) for moves, node, zero_index in layer], next_bound
+
+
+def parallelIdaStar(puzzle, heuristic, workers=None, max_nodes=None, deadline=None, progress=None):
+    """
+    IDA* that splits every threshold iteration across a pool of processes.
+
+    Each iteration expands the top of the tree until there are enough
+    subtrees, then searches them in parallel with the same threshold. Any
+    solution found within the threshold is optimal, so the first worker to
+    find one sets a shared flag and every other worker stops early.
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: A heuristic function to evaluate states.
+        workers (int): Worker processes (defaults to the CPU count).
+        max_nodes (int): Give up after expanding this many nodes (checked per iteration).
+        deadline (float): Give up once time.time() passes this value.
+        progress (callable): Called after every finished subtree with a dict of
+                             "expanded", "generated", "frontier" (subtrees left) and "bound".
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated").
+    """
+    workers = workers or os.cpu_count() or 1
+    state = list(puzzle.state)
+    goal_state = list(puzzle.goal)
+    dimension = puzzle.dimension
+    evaluate, _ = make_evaluator(heuristic, dimension, puzzle.goal)
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    cancel = context.Event()
+    expanded = 0
+    generated = 1
+    bound = evaluate(state)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(heuristic, dimension, goal_state, cancel)) as executor:
+        while True:
+            moves, roots, next_bound = _split_root(state, evaluate, dimension, goal_state, bound,
+                                                   workers * SUBTREES_PER_WORKER)
+            if moves is not None:
+                return moves, {"expanded": expanded, "generated": generated}
+
+            pending = {executor.submit(_search_subtree, node, zero_index, g,
+                                       root_moves[-1] if root_moves else None, bound, deadline): root_moves
+                       for root_moves, node, zero_index, g in roots}
+            solution = None
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    root_moves = pending.pop(future)
+                    try:
+                        subtree_moves, subtree_bound, subtree_expanded, subtree_generated = future.result()
+                    except SearchLimitReached:
+                        cancel.set()  # Out of time: stop the other workers too
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    expanded += subtree_expanded
+                    generated += subtree_generated
+                    next_bound = min(next_bound, subtree_bound)
+                    if progress is not None:
+                        progress({"expanded": expanded, "generated": generated,
+                                  "frontier": len(pending), "bound": bound})
+                    if subtree_moves is not None and solution is None:
+                        solution = root_moves + subtree_moves
+                        # Stop every other worker; queued subtrees are dropped
+                        cancel.set()
+                        for other in pending:
+                            other.cancel()
+                pending = {future: moves for future, moves in pending.items() if not future.cancelled()}
+            cancel.clear()
+
+            if solution is not None:
+                return solution, {"expanded": expanded, "generated": generated}
+            if next_bound == float("inf"):
+                raise ValueError("No solution found!")
+            if max_nodes is not None and expanded > max_nodes:
+                raise SearchLimitReached("node_limit", expanded)
+            if deadline is not None and time.time() > deadline:
+                raise SearchLimitReached("timeout", expanded)
+            bound = next_bound
@@ -0,0 +1,242 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from ranking import rank_positions, unrank_positions
+
+# Disjoint tile groups used by default for each board size. The tables of a
+# group only count moves of its own tiles, so the lookups can be added up.
+DEFAULT_PATTERNS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),  # 6-6-3
+    5: ((1, 2, 5, 6, 7, 12), (3, 4, 8, 9, 13, 14),
+        (10, 15, 16, 20, 21, 22), (11, 17, 18, 19, 23, 24)),  # 6-6-6-6
+}
+
+# Directory holding the prebuilt table files
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+# File layout: header, goal, one entry per pattern, then the raw tables
+PDB_MAGIC = b"NPDB"
+PDB_VERSION = 1
+HEADER_FORMAT = "<4sHHH"  # magic, version, dimension, number of patterns
+ENTRY_FORMAT = "<QQ"  # table offset, table length
+
+UNREACHED = 255
+
+# Largest board whose database is built on first use (well under a second).
+# The 4x4 and 5x5 tables take minutes to hours and are built ahead of time
+MAX_BUILD_DIMENSION = 3
+
+
+def table_size(num_cells, num_tiles):
+    """Number of ways to place num_tiles distinct tiles on num_cells cells."""
+    size = 1
+    for i in range(num_tiles):
+        size *= num_cells - i
+    return size
+
+
+def build_pattern_table(pattern, dimension, goal):
+    """
+    Compute the pattern table of one tile group with a breadth-first sweep.
+
+    Only moves of pattern tiles are counted; the blank walks over the other
+    cells for free. Each sweep first floods all free blank moves at the
+    current cost, then takes one pattern-tile move to reach the next layer.
+
+    Parameters:
+        pattern (tuple): The tiles in the group.
+        dimension (int): The dimension of the puzzle.
+        goal (list): The goal state as a 1D list.
+
+    Returns:
+        bytearray: Distance for every rank of the pattern tile positions.
+    """
+    num_cells = dimension * dimension
+    num_tiles = len(pattern)
+    table = bytearray([UNREACHED]) * table_size(num_cells, num_tiles)
+    # One bit per (rank, blank position) abstract state
+    visited = bytearray((len(table) * num_cells + 7) // 8)
+
+    neighbours = []
+    for index in range(num_cells):
+        row, col = divmod(index, dimension)
+        cells = []
+        if row > 0: cells.append(index - dimension)
+        if row < dimension - 1: cells.append(index + dimension)
+        if col > 0: cells.append(index - 1)
+        if col < dimension - 1: cells.append(index + 1)
+        neighbours.append(cells)
+
+    start = rank_positions([goal.index(tile) for tile in pattern], num_cells)
+    layer = [start * num_cells + goal.index(0)]
+    cost = 0
+    while layer:
+        next_layer = []
+        stack = []
+        for node in layer:
+            if not visited[node >> 3] & (1 << (node & 7)):
+                visited[node >> 3] |= 1 << (node & 7)
+                stack.append(node)
+        while stack:
+            node = stack.pop()
+            rank, blank = divmod(node, num_cells)
+            if table[rank] == UNREACHED:
+                table[rank] = cost
+            positions = unrank_positions(rank, num_tiles, num_cells)
+            for target in neighbours[blank]:
+                if target in positions:
+                    # A pattern tile slides into the blank: costs one move
+                    moved = positions[:]
+                    moved[moved.index(target)] = blank
+                    next_layer.append(rank_positions(moved, num_cells) * num_cells + target)
+                else:
+                    child = rank * num_cells + target
+                    if not visited[child >> 3] & (1 << (child & 7)):
+                        visited[child >> 3] |= 1 << (child & 7)
+                        stack.append(child)
+        layer = next_layer
+        cost += 1
+    return table
+
+
+def build_pattern_database(dimension, patterns=None, goal=None):
+    """Build the tables for every pattern; returns a list of (pattern, table)."""
+    patterns = patterns or DEFAULT_PATTERNS[dimension]
+    goal = goal or list(range(1, dimension * dimension)) + [0]
+    return [(tuple(pattern), build_pattern_table(pattern, dimension, goal)) for pattern in patterns]
+
+
+def save_pattern_database(path, dimension, goal, tables):
+    """Write the tables to a versioned binary file."""
+    header = struct.pack(HEADER_FORMAT, PDB_MAGIC, PDB_VERSION, dimension, len(tables))
+    header += bytes(goal)
+    entries_size = sum(1 + len(pattern) + struct.calcsize(ENTRY_FORMAT) for pattern, _ in tables)
+    data_start = len(header) + entries_size
+    data_start += -data_start % mmap.ALLOCATIONGRANULARITY  # Tables start page aligned
+
+    entries = b""
+    offset = data_start
+    for pattern, table in tables:
+        entries += bytes([len(pattern)]) + bytes(pattern) + struct.pack(ENTRY_FORMAT, offset, len(table))
+        offset += len(table)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # A temp file of its own, so concurrent builders never write into the same file
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(header + entries)
+            f.seek(data_start)
+            for _, table in tables:
+                f.write(table)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class PatternDatabase:
+    """
+    Disjoint additive pattern databases loaded from a memory-mapped file.
+
+    The file is mapped read-only, so every process that loads it shares one
+    copy of the tables through the page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, dimension, count = struct.unpack_from(HEADER_FORMAT, self.data, 0)
+        if magic != PDB_MAGIC:
+            raise ValueError(f"{path} is not a pattern database file")
+        if version != PDB_VERSION:
+            raise ValueError(f"{path} has version {version}, expected {PDB_VERSION}")
+        self.dimension = dimension
+        self.num_cells = dimension * dimension
+
+        position = struct.calcsize(HEADER_FORMAT)
+        self.goal = list(self.data[position:position + self.num_cells])
+        position += self.num_cells
+
+        self.patterns = []  # (tiles, table offset)
+        for _ in range(count):
+            size = self.data[position]
+            tiles = tuple(self.data[position + 1:position + 1 + size])
+            position += 1 + size
+            offset, _ = struct.unpack_from(ENTRY_FORMAT, self.data, position)
+            position += struct.calcsize(ENTRY_FORMAT)
+            self.patterns.append((tiles, offset))
+
+    def evaluate(self, state):
+        """Sum of the pattern table lookups for a state (1D list)."""
+        positions = [0] * self.num_cells
+        for index, tile in enumerate(state):
+            positions[tile] = index
+        data = self.data
+        num_cells = self.num_cells
+        total = 0
+        for tiles, offset in self.patterns:
+            total += data[offset + rank_positions([positions[tile] for tile in tiles], num_cells)]
+        return total
+
+    def __call__(self, puzzle):
+        if list(puzzle.goal) != self.goal:
+            raise ValueError("The pattern database was built for a different goal state")
+        return self.evaluate(puzzle.state)
+
+    def close(self):
+        self.data.close()
+
+
+def default_path(dimension):
+    return os.path.join(TABLE_DIR, f"pdb_{dimension}x{dimension}.bin")
+
+
+# Loaded databases, one per board dimension
+_databases = {}
+
+
+def load_pattern_database(dimension, build=None):
+    """
+    Load the default database for a board size, building it first if missing.
+
+    Building the 4x4 and 5x5 tables is a long one-off job; run
+    `python pattern_database.py <dimension>` ahead of time for those.
+    Args:
+        build (bool): Whether to build a missing database; by default only
+                      boards up to MAX_BUILD_DIMENSION are built.
+    Raises:
+        FileNotFoundError: If the database is missing and not built.
+    """
+    if dimension not in _databases:
+        path = default_path(dimension)
+        if not os.path.exists(path):
+            if build is None:
+                build = dimension <= MAX_BUILD_DIMENSION
+            if not build:
+                raise FileNotFoundError(f"No {dimension}x{dimension} pattern database at {path}; "
+                                        f"build it with `python pattern_database.py {dimension}`")
+            goal = list(range(1, dimension * dimension)) + [0]
+            save_pattern_database(path, dimension, goal, build_pattern_database(dimension))
+        _databases[dimension] = PatternDatabase(path)
+    return _databases[dimension]
+
+
+def pattern_database_heuristic(puzzle):
+    """Heuristic: Sum of the disjoint additive pattern database lookups."""
+    return load_pattern_database(puzzle.dimension)(puzzle)
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:] or ["3"]:
+        size = int(arg)
+        goal_state = list(range(1, size * size)) + [0]
+        save_pattern_database(default_path(size), size, goal_state, build_pattern_database(size))
+        print(f"Wrote {default_path(size)}")
@@ -1,6 +1,6 @@
-import random
-from heuristics import manhattan_heuristic, misplaced_tiles_heuristic, euclidean_heuristic, custom_heuristic
-from time import time
+from moves import move_targets
+from packed_state import PackedState
+from solvability import generate_solvable_state, is_solvable
 
 
 class N_Puzzle:
@@ -9,16 +9,13 @@ class N_Puzzle:
         self.dimension = size
         # self.state = self.generate_random_state()
         # self.goal = self.generate_goal_state()
-        self.state = state if state else self.generate_random_state()
-        self.goal = goal if goal else self.generate_goal_state()
+        # The goal comes first: random states are generated relative to it
+        self.goal = PackedState(goal if goal else self.generate_goal_state())
+        self.state = PackedState(state if state else self.generate_random_state())
 
     def generate_random_state(self):
         """Generate a random puzzle state."""
-        state = list(range(self.dimension*self.dimension))
-        random.shuffle(state)
-        while not self.is_solvable(state):
-            random.shuffle(state)
-        return state
+        return generate_solvable_state(self.dimension, self.goal)
 
     def generate_goal_state(self):
         """Generate the goal state."""
@@ -27,19 +24,10 @@ class N_Puzzle:
     
     def move(self, direction):
         """Move the blank tile (0) in the specified direction."""
-        zero_index = self.state.index(0)
-        row, col = divmod(zero_index, self.dimension)
-        if direction == "up" and row > 0:
-            swap_index = zero_index - self.dimension
-        elif direction == "down" and row < self.dimension - 1:
-            swap_index = zero_index + self.dimension
-        elif direction == "left" and col > 0:
-            swap_index = zero_index - 1
-        elif direction == "right" and col < self.dimension - 1:
-            swap_index = zero_index + 1
-        else:
-            return False
-        self.state[zero_index], self.state[swap_index] = self.state[swap_index], self.state[zero_index]
+        swap_index = move_targets(self.dimension)[self.state.blank].get(direction)
+        if swap_index is None:
+            return False  # Off the board
+        self.state = self.state.slide(swap_index)
         return True
 
     def is_goal(self):
@@ -48,26 +36,11 @@ class N_Puzzle:
 
     def get_possible_moves(self):
         """Get all possible moves for the blank tile (0)."""
-        zero_index = self.state.index(0)
-        row, col = divmod(zero_index, self.dimension)
-        moves = []
-        if row > 0: moves.append("up")
-        if row < self.dimension - 1: moves.append("down")
-        if col > 0: moves.append("left")
-        if col < self.dimension - 1: moves.append("right")
-        return moves
+        return list(move_targets(self.dimension)[self.state.blank])
 
     def is_solvable(self, state):
         """Check if the given state is solvable."""
-        inversions = 0
-        for i in range(len(state)):
-            for j in range(i + 1, len(state)):
-                if state[i] != 0 and state[j] != 0 and state[i] > state[j]:
-                    inversions += 1
-        if self.dimension % 2 == 1:
-            return inversions % 2 == 0
-        zero_row = self.dimension - (state.index(0) // self.dimension)
-        return (inversions + zero_row) % 2 == 0
+        return is_solvable(state, self.goal, self.dimension)
     
     def from_state(cls, state, goal):
         """
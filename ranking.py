@@ -0,0 +1,106 @@
+from math import factorial
+
+
+def rank_positions(positions, num_cells):
+    """
+    Rank the cell positions of the pattern tiles into 0 .. table_size - 1.
+
+    This is the Lehmer code of a partial permutation: with as many
+    positions as cells it ranks a full permutation in lexicographic order.
+
+    Parameters:
+        positions (sequence): Cell index of each pattern tile, in pattern order.
+        num_cells (int): Number of cells on the board.
+
+    Returns:
+        int: The rank of the partial permutation.
+    """
+    rank = 0
+    for i, position in enumerate(positions):
+        # Skip over the cells already taken by earlier tiles
+        smaller = 0
+        for j in range(i):
+            if positions[j] < position:
+                smaller += 1
+        rank = rank * (num_cells - i) + position - smaller
+    return rank
+
+
+def unrank_positions(rank, num_tiles, num_cells):
+    """Inverse of rank_positions."""
+    digits = [0] * num_tiles
+    for i in range(num_tiles - 1, -1, -1):
+        rank, digits[i] = divmod(rank, num_cells - i)
+    free = list(range(num_cells))
+    return [free.pop(digit) for digit in digits]
+
+
+def lehmer_rank(permutation):
+    """Lexicographic rank of a permutation of 0 .. n - 1, in 0 .. n! - 1."""
+    return rank_positions(permutation, len(permutation))
+
+
+def lehmer_unrank(rank, n):
+    """Inverse of lehmer_rank."""
+    return unrank_positions(rank, n, n)
+
+
+def myrvold_ruskey_rank(permutation):
+    """
+    Rank a permutation of 0 .. n - 1 in O(n) (Myrvold & Ruskey).
+
+    The ranks cover 0 .. n! - 1 like lehmer_rank, but not in lexicographic
+    order; use it where only a compact, invertible index matters.
+    """
+    permutation = list(permutation)
+    inverse = [0] * len(permutation)
+    for i, value in enumerate(permutation):
+        inverse[value] = i
+    rank = 0
+    radix = 1
+    for n in range(len(permutation), 1, -1):
+        # Undo the swap myrvold_ruskey_unrank made at this step
+        value = permutation[n - 1]
+        position = inverse[n - 1]
+        permutation[n - 1], permutation[position] = n - 1, value
+        inverse[value], inverse[n - 1] = position, n - 1
+        rank += value * radix
+        radix *= n
+    return rank
+
+
+def myrvold_ruskey_unrank(rank, n):
+    """Inverse of myrvold_ruskey_rank."""
+    permutation = list(range(n))
+    for size in range(n, 1, -1):
+        rank, digit = divmod(rank, size)
+        permutation[size - 1], permutation[digit] = permutation[digit], permutation[size - 1]
+    return permutation
+
+
+def solvable_count(num_cells):
+    """Number of states reachable from any one puzzle state: half of all placements."""
+    return factorial(num_cells) // 2
+
+
+def solvable_index(state):
+    """
+    Perfect index of a state among the states of its solvability class.
+
+    The index is blank position * (n - 1)! / 2 + Lehmer rank of the tile
+    order / 2. Ranks 2k and 2k + 1 differ by swapping the last two tiles,
+    which flips the permutation parity, so for a given blank cell exactly
+    one of them is solvable. The reachable states therefore map one-to-one
+    onto 0 .. solvable_count - 1.
+
+    Parameters:
+        state (sequence): The puzzle state as a 1D sequence (0 is the blank).
+    """
+    blank = 0
+    tiles = []
+    for i, tile in enumerate(state):
+        if tile:
+            tiles.append(tile - 1)
+        else:
+            blank = i
+    return blank * (factorial(len(tiles)) // 2) + (lehmer_rank(tiles) >> 1)
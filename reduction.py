@@ -0,0 +1,237 @@
+import time
+from collections import deque
+
+from heuristics import linear_conflict_heuristic
+from moves import neighbour_table
+from puzzle import N_Puzzle
+from solvability import is_solvable
+from utils import MOVE_OFFSETS, PROGRESS_INTERVAL, SearchLimitReached, search
+
+# Boards up to this size are left to the optimal engine
+FINISH_DIMENSION = 3
+
+
+class _Board:
+    """A board being reduced in place: tile positions, locked (solved) cells and the moves made so far."""
+
+    def __init__(self, tiles, dimension):
+        self.tiles = list(tiles)
+        self.dimension = dimension
+        self.position = [0] * len(self.tiles)  # tile -> cell
+        for i, tile in enumerate(self.tiles):
+            self.position[tile] = i
+        self.locked = bytearray(len(self.tiles))
+        self.neighbours = [[target for target, _ in moves] for moves in neighbour_table(dimension)]
+        # Blank move name by change of the blank's cell index
+        self.move_names = {row_offset * dimension + col_offset: move
+                           for move, (row_offset, col_offset) in MOVE_OFFSETS.items()}
+        self.pending = []  # Moves not yet handed to the caller
+
+    def cell(self, row, col):
+        return row * self.dimension + col
+
+    def move_blank(self, target):
+        """Slide the tile at the (adjacent) target cell into the blank."""
+        blank = self.position[0]
+        tile = self.tiles[target]
+        self.tiles[blank], self.tiles[target] = tile, 0
+        self.position[tile], self.position[0] = blank, target
+        self.pending.append(self.move_names[target - blank])
+
+    def path(self, start, goal, avoid=None):
+        """Shortest path of free cells from start to goal, without start itself."""
+        if start == goal:
+            return []
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for neighbour in self.neighbours[cell]:
+                if neighbour in previous or self.locked[neighbour] or neighbour == avoid:
+                    continue
+                previous[neighbour] = cell
+                if neighbour == goal:
+                    path = []
+                    while neighbour != start:
+                        path.append(neighbour)
+                        neighbour = previous[neighbour]
+                    path.reverse()
+                    return path
+                queue.append(neighbour)
+        raise RuntimeError("reduction solver got stuck: no free path")  # Means a bug, not a bad input
+
+    def route_blank(self, target, avoid=None):
+        """Walk the blank to target without touching locked cells or `avoid`."""
+        for cell in self.path(self.position[0], target, avoid):
+            self.move_blank(cell)
+
+    def move_tile(self, tile, target):
+        """Bring a tile to target, walking the blank around it one step at a time."""
+        for cell in self.path(self.position[tile], target):
+            self.route_blank(cell, avoid=self.position[tile])
+            self.move_blank(self.position[tile])
+
+    def place(self, tile, target):
+        self.move_tile(tile, target)
+        self.locked[target] = 1
+
+    def place_pair(self, first, first_target, second, second_target, holding, window):
+        """
+        Place the last two tiles of a row or column.
+
+        They cannot simply be placed one after the other: with the first
+        locked, the second target is a dead end. Instead the first tile is
+        placed, the second brought to `holding`, the blank into the window
+        (the 3x3 corner of the unsolved part next to both targets), and a
+        breadth-first search over the window finds the shortest blank walk
+        that puts both tiles in place. Other tiles count as interchangeable,
+        which keeps that search to a few hundred states.
+        """
+        self.move_tile(first, first_target)
+        self.locked[first_target] = 1
+        window = [cell for cell in window if not self.locked[cell] or cell == first_target]
+        if self.position[second] not in window:
+            self.move_tile(second, holding)
+        self.locked[self.position[second]] = 1
+        if self.position[0] not in window:
+            blank_targets = set(window)
+            previous = {self.position[0]: None}
+            queue = deque([self.position[0]])
+            while queue:
+                cell = queue.popleft()
+                if cell in blank_targets:
+                    break
+                for neighbour in self.neighbours[cell]:
+                    if neighbour not in previous and not self.locked[neighbour]:
+                        previous[neighbour] = cell
+                        queue.append(neighbour)
+            path = []
+            while previous[cell] is not None:
+                path.append(cell)
+                cell = previous[cell]
+            for cell in reversed(path):
+                self.move_blank(cell)
+        self.locked[first_target] = self.locked[self.position[second]] = 0
+
+        # Breadth-first search over (blank, first tile, second tile) cells inside the window
+        inside = set(window)
+        start = (self.position[0], self.position[first], self.position[second])
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            blank, first_cell, second_cell = node
+            if first_cell == first_target and second_cell == second_target:
+                break
+            for neighbour in self.neighbours[blank]:
+                if neighbour not in inside:
+                    continue
+                child = (neighbour,
+                         blank if first_cell == neighbour else first_cell,
+                         blank if second_cell == neighbour else second_cell)
+                if child not in previous:
+                    previous[child] = node
+                    queue.append(child)
+        path = []
+        while previous[node] is not None:
+            path.append(node[0])
+            node = previous[node]
+        for cell in reversed(path):
+            self.move_blank(cell)
+        self.locked[first_target] = self.locked[second_target] = 1
+
+    def flush(self):
+        moves, self.pending = self.pending, []
+        return moves
+
+
+def reduction_moves(puzzle, heuristic=linear_conflict_heuristic, deadline=None):
+    """
+    Generate a (suboptimal) solution for any board size, move by move.
+
+    The top row and then the left column of the unsolved part are placed
+    tile by tile and locked, which leaves an (N-1)x(N-1) board; this repeats
+    until FINISH_DIMENSION, which an optimal A* search solves. Each tile
+    takes O(N) steps with short blank detours, so the whole run is
+    polynomial (about O(N^3) moves), and moves are yielded as soon as each
+    tile is placed.
+
+    Goals must have the blank in the bottom-right cell; the tiles are
+    renamed so any such goal is handled.
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: Heuristic for the optimal finish (linear conflict if None).
+        deadline (float): Give up once time.time() passes this value (checked per tile).
+    Yields:
+        str: The blank moves, in order.
+    """
+    heuristic = heuristic or linear_conflict_heuristic
+    dimension = puzzle.dimension
+    goal = list(puzzle.goal)
+    last = dimension * dimension - 1
+    if goal[last] != 0:
+        raise ValueError("the reduction solver needs a goal with the blank in the bottom-right cell")
+    if not is_solvable(puzzle.state, goal, dimension):
+        raise ValueError("No solution found: the puzzle is not solvable")
+    # Rename tiles so the goal becomes 1, 2, ..., 0: tile t belongs in cell t - 1
+    renamed = [0] * len(goal)
+    for i, tile in enumerate(goal[:last]):
+        renamed[tile] = i + 1
+    board = _Board([renamed[tile] for tile in puzzle.state], dimension)
+
+    def goal_tile(row, col):
+        return row * dimension + col + 1
+
+    def check_deadline():
+        if deadline is not None and time.time() > deadline:
+            raise SearchLimitReached("timeout", 0)
+
+    for k in range(dimension - FINISH_DIMENSION):
+        # Top row of the unsolved part: all but the last two tiles go straight in
+        for col in range(k, dimension - 2):
+            board.place(goal_tile(k, col), board.cell(k, col))
+            check_deadline()
+            yield from board.flush()
+        corner = [board.cell(row, col) for row in range(k, k + 3) for col in range(dimension - 3, dimension)]
+        board.place_pair(goal_tile(k, dimension - 2), board.cell(k, dimension - 2),
+                         goal_tile(k, dimension - 1), board.cell(k, dimension - 1),
+                         board.cell(k + 2, dimension - 2), corner)
+        yield from board.flush()
+
+        # Then its left column, below the row just solved
+        for row in range(k + 1, dimension - 2):
+            board.place(goal_tile(row, k), board.cell(row, k))
+            check_deadline()
+            yield from board.flush()
+        corner = [board.cell(row, col) for row in range(dimension - 3, dimension) for col in range(k, k + 3)]
+        board.place_pair(goal_tile(dimension - 2, k), board.cell(dimension - 2, k),
+                         goal_tile(dimension - 1, k), board.cell(dimension - 1, k),
+                         board.cell(dimension - 2, k + 2), corner)
+        yield from board.flush()
+
+    # Optimal finish on the remaining bottom-right corner
+    size = min(dimension, FINISH_DIMENSION)
+    first = dimension - size
+    cells = [board.cell(row, col) for row in range(first, dimension) for col in range(first, dimension)]
+    # Rename the corner's tiles to 1 .. size*size - 1 in goal order
+    corner_tiles = {goal_tile(*divmod(cell, dimension)): i + 1 for i, cell in enumerate(cells[:-1])}
+    corner_tiles[0] = 0
+    corner = N_Puzzle(size, state=[corner_tiles[board.tiles[cell]] for cell in cells])
+    moves, _ = search(corner, heuristic, "astar", deadline=deadline)
+    yield from moves
+
+
+def reductionSearch(puzzle, heuristic=linear_conflict_heuristic, max_nodes=None, deadline=None, progress=None):
+    """
+    Solve boards of any size with the reduction solver (see reduction_moves).
+
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated"), here the number of moves.
+    """
+    moves = []
+    for move in reduction_moves(puzzle, heuristic, deadline):
+        moves.append(move)
+        if progress is not None and len(moves) % PROGRESS_INTERVAL == 0:
+            progress({"expanded": len(moves), "generated": len(moves), "frontier": 0})
+    return moves, {"expanded": len(moves), "generated": len(moves)}
@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from batch import parse_state_line, solve_task
+from heuristics import HEURISTICS, warm_tables
+from utils import ALGORITHMS
+
+# Requests waiting for a solver before readers stop accepting more
+DEFAULT_QUEUE_SIZE = 64
+
+# Longest accepted request line (a 100x100 board as JSON fits easily)
+MAX_LINE_BYTES = 1 << 20
+
+
+class SolveServer:
+    """
+    A local solve service that keeps warm solver processes between requests.
+
+    Clients connect over a Unix socket or localhost TCP and send one JSON
+    request per line: a state in any form batch.py accepts, optionally with
+    "id", "goal", "algorithm", "heuristic", "timeout", "max_nodes" and
+    "weight". Each request gets one JSON line back, a solve_task result
+    with the request's id, in completion order.
+
+    Requests wait in a bounded queue for one of `workers` solver processes.
+    The processes are forked after the heuristic tables are built, and they
+    keep their own caches from one request to the next. While the queue is
+    full, connections are not read any further, so clients feel the
+    back-pressure through their socket instead of the server buffering
+    without limit. A request whose deadline passes while it waits is
+    answered with "timeout" without being searched.
+
+    Identical requests in flight at the same time are coalesced: they share
+    one search, and each waits only until its own deadline. The search runs
+    with the time limit of the first of them; a request with a later
+    deadline that sees it time out queues a new search of its own.
+    Args:
+        heuristic (str): Default heuristic, a key of heuristics.HEURISTICS.
+        algorithm (str): Default algorithm, any accepted by utils.search.
+        workers (int): Solver processes (defaults to the CPU count).
+        queue_size (int): Requests waiting for a solver before back-pressure starts.
+        timeout (float): Default per-request time limit in seconds (None: no limit).
+        max_nodes (int): Default per-request node expansion limit.
+        warm_dimension (int): Board size to build the heuristic tables for before forking.
+    """
+
+    def __init__(self, heuristic="manhattan", algorithm="astar", workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 timeout=None, max_nodes=None, warm_dimension=None):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic: {heuristic}")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {algorithm}")
+        self.heuristic = heuristic
+        self.algorithm = algorithm
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.warm_dimension = warm_dimension
+
+        self.queue = None
+        self.executor = None
+        self.server = None
+        self.dispatchers = []
+        self.in_flight = {}  # request key -> future of the search answering it
+        self.connections = {}  # handler task -> writer of every open connection
+        self.counters = {"requests": 0, "searches": 0, "coalesced": 0, "expired": 0}
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """Start the solver processes and listen on `path` (Unix socket) or host:port."""
+        # Imported here so importing this module stays cheap
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if self.warm_dimension:
+            # Built once here; forked workers inherit the tables instead of rebuilding them
+            warm_tables(HEURISTICS[self.heuristic], self.warm_dimension)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        # Fork the workers now: forked later, they would inherit open client
+        # sockets and keep those connections from ever closing
+        await asyncio.get_running_loop().run_in_executor(self.executor, os.getpid)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path=path, limit=MAX_LINE_BYTES)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_BYTES)
+        return self.server
+
+    @property
+    def address(self):
+        """The listening address: a socket path, or (host, port)."""
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        self.server.close()
+        for writer in self.connections.values():
+            writer.close()  # Their handlers see the end of input and finish
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        await self.server.wait_closed()
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+    def _prepare(self, task):
+        """Fill in the defaults and check a request; returns (key, deadline, solve_task arguments)."""
+        heuristic = task.get("heuristic", self.heuristic)
+        algorithm = task.get("algorithm", self.algorithm)
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic: {heuristic}")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {algorithm}")
+        timeout = task.get("timeout", self.timeout)
+        max_nodes = task.get("max_nodes", self.max_nodes)
+        options = {"weight": float(task["weight"])} if "weight" in task else {}
+        goal = tuple(task["goal"]) if task.get("goal") is not None else None
+        key = (tuple(task["state"]), goal, heuristic, algorithm, max_nodes, tuple(sorted(options.items())))
+        deadline = time.time() + timeout if timeout else None
+        return key, deadline, (heuristic, algorithm, max_nodes, options)
+
+    async def enqueue(self, task):
+        """
+        Queue the search for a request, or join an identical one in flight.
+
+        Waits while the queue is full. Returns a ticket for result().
+        """
+        key, deadline, arguments = self._prepare(task)
+        self.counters["requests"] += 1
+        return key, deadline, arguments, await self._search(task, key, deadline, arguments)
+
+    async def _search(self, task, key, deadline, arguments):
+        future = self.in_flight.get(key)
+        if future is not None and not future.done():
+            self.counters["coalesced"] += 1
+            return future
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+
+        def forget(done):
+            if self.in_flight.get(key) is done:
+                del self.in_flight[key]
+        future.add_done_callback(forget)
+        await self.queue.put(({"state": task["state"], "goal": task.get("goal")}, deadline, arguments, future))
+        return future
+
+    async def result(self, task, ticket):
+        """Wait for a queued search until the request's own deadline."""
+        key, deadline, arguments, future = ticket
+        start = time.time()
+        while True:
+            try:
+                if deadline is None:
+                    result = await asyncio.shield(future)
+                else:
+                    result = await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.time()))
+            except asyncio.TimeoutError:
+                result = {"status": "timeout", "expanded": 0, "time": time.time() - start}
+            # A coalesced search can run out of time before this request does
+            if result["status"] != "timeout" or (deadline is not None and time.time() >= deadline):
+                return dict(result, id=task.get("id"))
+            future = await self._search(task, key, deadline, arguments)
+
+    async def submit(self, task):
+        """Solve one request (a task dict) and return its result."""
+        return await self.result(task, await self.enqueue(task))
+
+    async def _dispatch(self):
+        """Feed queued searches to the solver processes, one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            task, deadline, (heuristic, algorithm, max_nodes, options), future = await self.queue.get()
+            try:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        # Expired in the queue: not worth a search
+                        self.counters["expired"] += 1
+                        future.set_result({"status": "timeout", "expanded": 0, "time": 0.0})
+                        continue
+                self.counters["searches"] += 1
+                result = await loop.run_in_executor(self.executor, solve_task, task, heuristic, algorithm,
+                                                    remaining, max_nodes, options)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as error:  # A broken pool or a bad request must not stop the dispatcher
+                if not future.done():
+                    future.set_result({"status": "error", "error": str(error)})
+            finally:
+                self.queue.task_done()
+
+    async def _handle(self, reader, writer):
+        """Serve one connection: read requests, write results as they finish."""
+        self.connections[asyncio.current_task()] = writer
+        replies = set()
+
+        async def reply(task, ticket):
+            result = await self.result(task, ticket)
+            writer.write((json.dumps(result) + "\n").encode())
+            await writer.drain()
+
+        try:
+            number = 0
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Line longer than MAX_LINE_BYTES
+                    writer.write((json.dumps({"status": "error", "error": "request too long"}) + "\n").encode())
+                    break
+                if not line:
+                    break
+                try:
+                    task = parse_state_line(line.decode(), number)
+                    if task is None:
+                        continue
+                    # Back-pressure: this connection is not read while the queue is full
+                    ticket = await self.enqueue(task)
+                except (ValueError, KeyError, TypeError) as error:
+                    writer.write((json.dumps({"id": number, "status": "error", "error": str(error)}) + "\n").encode())
+                    continue
+                finally:
+                    number += 1
+                replies.add(asyncio.create_task(reply(task, ticket)))
+                replies = {pending for pending in replies if not pending.done()}
+            await asyncio.gather(*replies, return_exceptions=True)
+        except ConnectionError:
+            pass  # The client went away; its searches still answer any coalesced requests
+        finally:
+            del self.connections[asyncio.current_task()]
+            writer.close()
+
+
+async def query(tasks, host="127.0.0.1", port=None, path=None):
+    """
+    Send task dicts to a running server and return the results in request order.
+
+    Args:
+        tasks: Iterable of task dicts (see batch.parse_state_line).
+        host, port: TCP address of the server.
+        path (str): Unix socket path, used instead of host and port.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE_BYTES)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+    tasks = [dict(task, id=task.get("id", number)) for number, task in enumerate(tasks)]
+    for task in tasks:
+        writer.write((json.dumps(task) + "\n").encode())
+    await writer.drain()
+    results = {}
+    while len(results) < len(tasks):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection early")
+        result = json.loads(line)
+        results[result["id"]] = result
+    writer.close()
+    await writer.wait_closed()
+    return [results[task["id"]] for task in tasks]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m server",
+                                     description="Serve N-puzzle solves as JSON lines over a local socket.")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--heuristic", default="manhattan", choices=sorted(HEURISTICS))
+    parser.add_argument("--algorithm", default="astar", choices=ALGORITHMS)
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument("--timeout", type=float, default=None, help="default time limit per request in seconds")
+    parser.add_argument("--max-nodes", type=int, default=None, help="default node expansion limit per request")
+    parser.add_argument("--warm", type=int, default=None, metavar="N",
+                        help="build the heuristic tables for NxN boards before starting the solvers")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = SolveServer(args.heuristic, args.algorithm, args.workers, args.queue_size, args.timeout,
+                             args.max_nodes, args.warm)
+        await server.start(args.host, args.port, args.unix)
+        print(f"Listening on {server.address}", file=sys.stderr, flush=True)
+        try:
+            await server.server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
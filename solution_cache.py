@@ -0,0 +1,203 @@
+import os
+import sqlite3
+from collections import OrderedDict
+from functools import lru_cache
+
+from packed_state import PackedState
+from pattern_database import TABLE_DIR
+from utils import MOVE_OFFSETS, search
+
+DEFAULT_CACHE_PATH = os.path.join(TABLE_DIR, "solutions.sqlite")
+
+# Moves by (row_offset, col_offset)
+MOVES_BY_OFFSET = {offset: move for move, offset in MOVE_OFFSETS.items()}
+
+# The eight symmetries of a square board, as maps of (row, col) with m = dimension - 1
+BOARD_SYMMETRIES = (
+    lambda r, c, m: (r, c),
+    lambda r, c, m: (c, m - r),
+    lambda r, c, m: (m - r, m - c),
+    lambda r, c, m: (m - c, r),
+    lambda r, c, m: (r, m - c),
+    lambda r, c, m: (m - r, c),
+    lambda r, c, m: (c, r),
+    lambda r, c, m: (m - c, m - r),
+)
+
+
+@lru_cache(maxsize=16)
+def goal_symmetries(dimension, goal):
+    """
+    The board symmetries that keep the goal's blank cell in place.
+
+    A symmetry moves every cell and renames every tile to the goal tile of
+    the cell it maps to, so the goal maps onto itself and distances to it
+    are unchanged. Only symmetries fixing the blank's goal cell keep the
+    blank a blank.
+
+    Returns:
+        tuple: (cell_map, tile_map, move_map) per symmetry, identity first.
+    """
+    m = dimension - 1
+    goal_index = [0] * len(goal)
+    for i, tile in enumerate(goal):
+        goal_index[tile] = i
+    symmetries = []
+    for symmetry in BOARD_SYMMETRIES:
+        cell_map = [0] * len(goal)
+        for i in range(len(goal)):
+            row, col = symmetry(i // dimension, i % dimension, m)
+            cell_map[i] = row * dimension + col
+        if cell_map[goal_index[0]] != goal_index[0]:
+            continue
+        tile_map = [goal[cell_map[goal_index[tile]]] for tile in range(len(goal))]
+        # How a blank move looks after the symmetry (the map is affine)
+        origin = symmetry(0, 0, m)
+        move_map = {}
+        for move, (row_offset, col_offset) in MOVE_OFFSETS.items():
+            row, col = symmetry(row_offset, col_offset, m)
+            move_map[move] = MOVES_BY_OFFSET[(row - origin[0], col - origin[1])]
+        symmetries.append((cell_map, tile_map, move_map))
+    return tuple(symmetries)
+
+
+def canonical_key(state, goal, dimension):
+    """
+    The smallest encoding of the state over the goal-preserving symmetries.
+
+    Returns:
+        key (bytes): One byte per tile of the canonical state.
+        move_map (dict): Maps moves on the state to moves on the canonical state.
+    """
+    best_key, best_move_map = None, None
+    for cell_map, tile_map, move_map in goal_symmetries(dimension, tuple(goal)):
+        transformed = bytearray(len(cell_map))
+        for i, tile in enumerate(state):
+            transformed[cell_map[i]] = tile_map[tile]
+        key = bytes(transformed)
+        if best_key is None or key < best_key:
+            best_key, best_move_map = key, move_map
+    return best_key, best_move_map
+
+
+class SolutionCache:
+    """
+    Exact distances to the goal and optimal next moves for states on solved paths.
+
+    Entries are keyed by canonical state (see canonical_key), so one entry
+    also covers every mirrored position. The most recently used entries are
+    kept in memory, up to max_entries; with a path, every entry is also
+    stored in a local SQLite file and survives between runs.
+    """
+
+    def __init__(self, path=None, max_entries=100000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (goal key, state key) -> (distance, canonical move)
+        self.db = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS solutions ("
+                            "goal BLOB, state BLOB, distance INTEGER, move TEXT, "
+                            "PRIMARY KEY (goal, state))")
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Evict the least recently used
+
+    def get(self, state, goal, dimension, use_disk=True):
+        """
+        Look up a state.
+
+        Returns:
+            (distance, move) with the optimal next move for this exact state
+            (None at the goal), or None if the state is not cached.
+        """
+        state_key, move_map = canonical_key(state, goal, dimension)
+        key = (bytes(goal), state_key)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif use_disk and self.db is not None:
+            row = self.db.execute("SELECT distance, move FROM solutions WHERE goal = ? AND state = ?",
+                                  key).fetchone()
+            if row is None:
+                return None
+            entry = (row[0], row[1])
+            self._remember(key, entry)
+        else:
+            return None
+        distance, canonical_move = entry
+        if canonical_move is None:
+            return distance, None
+        inverse = {canonical: move for move, canonical in move_map.items()}
+        return distance, inverse[canonical_move]
+
+    def remaining_moves(self, state, goal, dimension, use_disk=True):
+        """Follow cached next moves from `state` to the goal; None unless the whole path is cached."""
+        state = PackedState(state)
+        moves = []
+        entry = self.get(state, goal, dimension, use_disk)
+        while entry is not None:
+            distance, move = entry
+            if move is None:
+                return moves
+            row_offset, col_offset = MOVE_OFFSETS[move]
+            state = state.slide(state.blank + row_offset * dimension + col_offset)
+            moves.append(move)
+            entry = self.get(state, goal, dimension, use_disk)
+            if entry is not None and entry[0] != distance - 1:
+                return None  # Entries from different solutions that do not chain up
+        return None
+
+    def record_solution(self, state, goal, dimension, moves):
+        """Store every state along an optimal solution with its distance and next move."""
+        state = PackedState(state)
+        rows = []
+        for i, move in enumerate(moves + [None]):
+            state_key, move_map = canonical_key(state, goal, dimension)
+            key = (bytes(goal), state_key)
+            entry = (len(moves) - i, move_map[move] if move is not None else None)
+            self._remember(key, entry)
+            rows.append(key + entry)
+            if move is not None:
+                row_offset, col_offset = MOVE_OFFSETS[move]
+                state = state.slide(state.blank + row_offset * dimension + col_offset)
+        if self.db is not None:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)", rows)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+def solve_cached(puzzle, heuristic, cache, algorithm="astar", **options):
+    """
+    Solve through the cache.
+
+    A fully cached path answers the query without searching. Otherwise the
+    search runs with cached distances as exact h-values (A* stops as soon
+    as it reaches a cached state, see bestFirstSearch), and the optimal
+    path it finds is recorded for next time.
+
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters, with "cache_hit" set on a full hit.
+    """
+    state, goal, dimension = list(puzzle.state), list(puzzle.goal), puzzle.dimension
+    moves = cache.remaining_moves(state, goal, dimension)
+    if moves is not None:
+        return moves, {"expanded": 0, "generated": 0, "cache_hit": True}
+
+    if algorithm == "astar":
+        # Only the in-memory part is consulted per node; disk reads are too slow there
+        options["exact"] = lambda node: cache.remaining_moves(node, goal, dimension, use_disk=False)
+    moves, stats = search(puzzle, heuristic, algorithm, **options)
+    if algorithm in ("astar", "ida", "bidirectional", "bidirectional-astar"):
+        # Only optimal paths give exact distances (assumes an admissible heuristic)
+        cache.record_solution(state, goal, dimension, moves)
+    return moves, stats
@@ -0,0 +1,83 @@
+import random
+
+
+def default_goal(dimension):
+    """The usual goal: tiles in order with the blank (0) last."""
+    return list(range(1, dimension * dimension)) + [0]
+
+
+def count_inversions(values):
+    """
+    Count pairs i < j with values[i] > values[j] in O(n log n) using a Fenwick tree.
+
+    Parameters:
+        values (sequence): Distinct non-negative integers.
+
+    Returns:
+        int: The number of inversions.
+    """
+    size = max(values) + 1 if values else 0
+    tree = [0] * (size + 1)
+    inversions = 0
+    for seen, value in enumerate(values):
+        # Earlier values that are <= value
+        smaller = 0
+        i = value + 1
+        while i > 0:
+            smaller += tree[i]
+            i -= i & -i
+        inversions += seen - smaller
+        i = value + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def is_solvable(state, goal=None, dimension=None):
+    """
+    Check whether `goal` can be reached from `state`.
+
+    Every move swaps the blank with a neighbour: it flips the parity of the
+    permutation taking state to goal and moves the blank one step. So a
+    state is solvable exactly when that permutation's parity equals the
+    parity of the blank's Manhattan distance to its goal cell. This works
+    for any board width and any goal permutation.
+
+    Parameters:
+        state (sequence): The puzzle state as a 1D sequence.
+        goal (sequence): The goal state (defaults to default_goal).
+        dimension (int): The board dimension (defaults to sqrt(len(state))).
+    """
+    state = list(state)
+    dimension = dimension or int(round(len(state) ** 0.5))
+    goal = list(goal) if goal is not None else default_goal(dimension)
+
+    goal_index = [0] * len(goal)
+    for i, tile in enumerate(goal):
+        goal_index[tile] = i
+    # Where each tile of the state has to go, read in state order
+    permutation = [goal_index[tile] for tile in state]
+
+    blank_row, blank_col = divmod(state.index(0), dimension)
+    goal_row, goal_col = divmod(goal_index[0], dimension)
+    blank_distance = abs(blank_row - goal_row) + abs(blank_col - goal_col)
+    return count_inversions(permutation) % 2 == blank_distance % 2
+
+
+def generate_solvable_state(dimension, goal=None, rng=random):
+    """
+    Generate a uniformly random solvable state with a single shuffle.
+
+    If the shuffle is unsolvable, swapping two non-blank tiles flips the
+    permutation parity without moving the blank, which makes it solvable.
+    That swap pairs every unsolvable state with exactly one solvable one,
+    so the result stays uniform.
+    """
+    goal = list(goal) if goal is not None else default_goal(dimension)
+    state = goal[:]
+    rng.shuffle(state)
+    if not is_solvable(state, goal, dimension):
+        first, second = [i for i, tile in enumerate(state) if tile != 0][:2]
+        state[first], state[second] = state[second], state[first]
+    return state
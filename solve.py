@@ -0,0 +1,70 @@
+import argparse
+import json
+import sys
+
+from batch import parse_state_line, read_states, solve_task
+from heuristics import HEURISTICS
+from utils import ALGORITHMS
+
+
+def main(argv=None):
+    """
+    Headless solver: python -m solve [options] [tiles ...]
+
+    Tiles come from the command line (e.g. `1 2 3 4 0 5 7 8 6` or
+    `1,2,3,4,0,5,7,8,6`) or, without any, one state per line from stdin
+    in any form batch.py accepts. Prints one JSON result per state (bad
+    input included, as an error result) and exits with 1 if any state was
+    not solved.
+    """
+    parser = argparse.ArgumentParser(prog="python -m solve", description="Solve N-puzzle states without the GUI.")
+    parser.add_argument("tiles", nargs="*", help="the state, 0 is the blank (default: read states from stdin)")
+    parser.add_argument("--algorithm", default="astar", choices=ALGORITHMS)
+    parser.add_argument("--heuristic", default="manhattan", choices=sorted(HEURISTICS))
+    parser.add_argument("--goal", help="goal state as comma- or space-separated tiles (default: 1 .. n, blank last)")
+    parser.add_argument("--weight", type=float, help="weight for the weighted algorithm")
+    parser.add_argument("--workers", type=int, help="worker processes for the ida algorithm")
+    parser.add_argument("--timeout", type=float, default=None, help="time limit per state in seconds")
+    parser.add_argument("--max-nodes", type=int, default=None, help="node expansion limit per state")
+    parser.add_argument("--stats", action="store_true",
+                        help="add an \"instrumentation\" entry with detailed counters to every result")
+    parser.add_argument("--profile", action="store_true", help="profile every search and print the report to stderr")
+    args = parser.parse_args(argv)
+
+    options = {}
+    if args.weight is not None:
+        options["weight"] = args.weight
+    if args.workers is not None:
+        options["workers"] = args.workers
+    goal = None
+    if args.goal:
+        try:
+            goal = parse_state_line(args.goal, 0)["state"]
+        except ValueError as error:
+            parser.error(f"--goal: {error}")
+
+    if args.tiles:
+        tasks = list(read_states([" ".join(args.tiles)]))
+    else:
+        tasks = read_states(sys.stdin)
+    all_solved = True
+    for task in tasks:
+        if goal is not None:
+            task.setdefault("goal", goal)
+        instrument = None
+        if args.stats or args.profile:
+            from instrumentation import Instrumentation  # Imported here: only needed with --stats/--profile
+            instrument = Instrumentation(profile=args.profile)
+            options["instrument"] = instrument
+        result = solve_task(task, args.heuristic, args.algorithm, args.timeout, args.max_nodes, options)
+        if args.stats:
+            result["instrumentation"] = instrument.as_dict()
+        if args.profile:
+            print(instrument.profile_report(), file=sys.stderr)
+        all_solved = all_solved and result["status"] == "solved"
+        print(json.dumps(result), flush=True)
+    return 0 if all_solved else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
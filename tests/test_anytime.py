@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from anytime import anytimeSearch
+from heuristics import linear_conflict_heuristic, manhattan_heuristic
+from moves import neighbour_table
+from puzzle import N_Puzzle
+from utils import search
+
+
+def scrambled_4x4(depth, seed):
+    """The 4x4 goal after `depth` random moves that never undo the last one."""
+    rng = random.Random(seed)
+    state = list(range(1, 16)) + [0]
+    blank, previous = 15, None
+    for _ in range(depth):
+        target = rng.choice([target for target, _ in neighbour_table(4)[blank] if target != previous])
+        state[blank], state[target] = state[target], 0
+        previous, blank = blank, target
+    return state
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_solutions_improve_until_optimal(seed):
+    state = scrambled_4x4(60, seed)
+    solutions = list(anytimeSearch(N_Puzzle(4, state=state), manhattan_heuristic))
+    costs = [len(moves) for moves, _ in solutions]
+    weights = [stats["weight"] for _, stats in solutions]
+    bounds = [stats["bound"] for _, stats in solutions]
+    assert len(solutions) > 1
+    assert all(later <= earlier for earlier, later in zip(costs, costs[1:]))
+    assert all(later < earlier for earlier, later in zip(weights, weights[1:]))
+    assert all(later <= earlier for earlier, later in zip(bounds, bounds[1:]))
+    assert bounds[-1] == 1.0
+    optimal, _ = search(N_Puzzle(4, state=state), linear_conflict_heuristic, "ida")
+    assert costs[-1] == len(optimal) < costs[0]
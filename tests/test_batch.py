@@ -0,0 +1,43 @@
+import json
+
+from batch import main, read_states, solve_batch, solve_task
+
+SOLVABLE = "1 2 3 4 5 6 7 0 8"
+
+
+def test_solve_task_reports_out_of_range_tile():
+    result = solve_task({"id": 0, "state": [1, 2, 3, 4, 5, 6, 7, 0, 9]})
+    assert result["status"] == "error"
+    assert "exactly once" in result["error"]
+
+
+def test_solve_task_reports_non_square_state():
+    result = solve_task({"id": 0, "state": [1, 2, 0, 3, 4]})
+    assert result["status"] == "error"
+    assert "not a square board" in result["error"]
+
+
+def test_read_states_turns_malformed_line_into_error_record():
+    tasks = list(read_states(['{"state": [1, 2', SOLVABLE]))
+    assert [task["id"] for task in tasks] == [0, 1]
+    assert solve_task(tasks[0])["status"] == "error"
+    assert solve_task(tasks[1])["status"] == "solved"
+
+
+def test_solve_batch_keeps_going_after_bad_lines():
+    lines = ["not a state", "1 2 3 4 5 6 7 0 9", SOLVABLE, "[1, 0, 2]"]
+    results = {result["id"]: result for result in solve_batch(read_states(lines), workers=1)}
+    assert {number: result["status"] for number, result in results.items()} == \
+        {0: "error", 1: "error", 2: "solved", 3: "error"}
+    assert results[2]["num_moves"] == 1
+
+
+def test_main_exits_non_zero_when_a_line_fails(tmp_path, capsys):
+    path = tmp_path / "states.txt"
+    path.write_text(SOLVABLE + "\n{oops\n")
+    assert main([str(path), "--workers", "1"]) == 1
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(result["status"] for result in results) == ["error", "solved"]
+
+    path.write_text(SOLVABLE + "\n")
+    assert main([str(path), "--workers", "1"]) == 0
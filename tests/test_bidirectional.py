@@ -0,0 +1,19 @@
+from heuristics import manhattan_heuristic, pattern_database_heuristic
+from puzzle import N_Puzzle
+from utils import search
+
+# One of the two hardest 8-puzzle states: 31 moves from the goal
+EIGHT_PUZZLE = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+
+
+def solves(state, moves):
+    puzzle = N_Puzzle(3, state=state)
+    return all(puzzle.move(move) for move in moves) and puzzle.is_goal()
+
+
+def test_bidirectional_astar_with_goal_specific_heuristic_stays_optimal():
+    # The pattern database only knows the default goal, so the backward side falls back
+    moves, _ = search(N_Puzzle(3, state=EIGHT_PUZZLE), pattern_database_heuristic, "bidirectional-astar")
+    optimal, _ = search(N_Puzzle(3, state=EIGHT_PUZZLE), manhattan_heuristic, "astar")
+    assert len(moves) == len(optimal)
+    assert solves(EIGHT_PUZZLE, moves)
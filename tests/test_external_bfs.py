@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from external_bfs import MANIFEST, external_bfs, iter_layer
+
+# States at each distance from the 3x3 goal with the blank in a corner
+LAYERS_3X3 = [1, 2, 4, 8, 16, 20, 39, 62, 116, 152, 286, 396, 748, 1024, 1893, 2512, 4485, 5638, 9529, 10878,
+              16993, 17110, 23952, 20224, 24047, 15578, 14560, 6274, 3910, 760, 221, 2]
+GOAL_3X3 = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+def test_2x2_layers(tmp_path):
+    assert external_bfs([1, 2, 3, 0], 2, str(tmp_path)) == [1, 2, 2, 2, 2, 2, 1]
+
+
+def test_3x3_layers_with_many_runs(tmp_path):
+    # A small buffer forces several runs per layer through the merge
+    layers = external_bfs(GOAL_3X3, 3, str(tmp_path), buffer_states=20000)
+    assert layers == LAYERS_3X3
+    assert sum(layers) == 181440 and len(layers) - 1 == 31
+    assert len(list(iter_layer(str(tmp_path), 31, 9))) == 2
+
+
+def test_resume_from_manifest(tmp_path):
+    work_dir = str(tmp_path)
+    assert external_bfs(GOAL_3X3, 3, work_dir, max_depth=12) == LAYERS_3X3[:13]
+    # Leftovers of a layer interrupted mid-way are discarded on resume
+    (tmp_path / "run_00000.bin").write_bytes(b"\0" * 8)
+    (tmp_path / "layer_0013.bin.tmp").write_bytes(b"\0" * 8)
+    layers = []
+    external_bfs(GOAL_3X3, 3, work_dir, progress=lambda stats: layers.append(stats["depth"]))
+    assert layers[0] == 13  # Nothing before the manifest's last layer was redone
+    assert external_bfs(GOAL_3X3, 3, work_dir) == LAYERS_3X3
+    assert MANIFEST in os.listdir(work_dir)
+    assert not [name for name in os.listdir(work_dir) if name.startswith("run_") or name.endswith(".tmp")]
+
+
+def test_resume_rejects_other_start(tmp_path):
+    external_bfs(GOAL_3X3, 3, str(tmp_path), max_depth=2)
+    with pytest.raises(ValueError, match="another start state"):
+        external_bfs([1, 2, 3, 4, 5, 6, 7, 0, 8], 3, str(tmp_path))
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from frontier import BucketFrontier, HeapFrontier, make_frontier
+from heuristics import linear_conflict_heuristic, manhattan_heuristic, misplaced_tiles_heuristic
+from puzzle import N_Puzzle
+from solvability import generate_solvable_state
+from utils import bestFirstSearch
+
+
+def test_bucket_and_heap_pop_in_same_order():
+    rng = random.Random(14)
+    bucket, heap = BucketFrontier(), HeapFrontier()
+    popped = []
+    for node in range(2000):
+        # Few distinct values, so priorities and h tie often
+        priority, h = rng.randrange(10), rng.randrange(4)
+        bucket.push(priority, h, node)
+        heap.push(priority, h, node)
+        if rng.random() < 0.4:
+            assert bucket.min_priority() == heap.min_priority()
+            popped.append(bucket.pop())
+            assert heap.pop() == popped[-1]
+    while heap:
+        assert bucket.pop() == heap.pop()
+    assert len(bucket) == 0
+    assert len(popped) > 500
+
+
+def test_ties_go_to_lowest_h_then_newest():
+    for frontier in (BucketFrontier(), HeapFrontier()):
+        for priority, h, node in [(5, 2, "a"), (5, 1, "b"), (5, 1, "c"), (3, 3, "d"), (5, 0, "e")]:
+            frontier.push(priority, h, node)
+        assert [frontier.pop() for _ in range(5)] == ["d", "e", "c", "b", "a"]
+
+
+def test_make_frontier_rejects_bucket_for_float_priorities():
+    assert isinstance(make_frontier("auto", integral=False), HeapFrontier)
+    with pytest.raises(ValueError):
+        make_frontier("bucket", integral=False)
+
+
+@pytest.mark.parametrize("heuristic", [misplaced_tiles_heuristic, manhattan_heuristic, linear_conflict_heuristic],
+                         ids=lambda heuristic: heuristic.__name__)
+@pytest.mark.parametrize("mode", ["astar", "greedy"])
+def test_best_first_search_same_counts_with_either_frontier(heuristic, mode):
+    rng = random.Random(7)
+    for _ in range(5):
+        state = generate_solvable_state(3, rng=rng)
+        bucket_moves, bucket_stats = bestFirstSearch(N_Puzzle(3, state=state), heuristic, mode, frontier="bucket")
+        heap_moves, heap_stats = bestFirstSearch(N_Puzzle(3, state=state), heuristic, mode, frontier="heap")
+        assert bucket_moves == heap_moves
+        assert bucket_stats == heap_stats
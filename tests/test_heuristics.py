@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from distance_table import load_distance_table
+from heuristics import (HeuristicContext, linear_conflict_heuristic, manhattan_heuristic, misplaced_tiles_heuristic,
+                        walking_distance_heuristic)
+from pattern_database import pattern_database_heuristic
+from puzzle import N_Puzzle
+from solvability import default_goal, generate_solvable_state
+from utils import search
+
+ADMISSIBLE = [misplaced_tiles_heuristic, manhattan_heuristic, linear_conflict_heuristic,
+              walking_distance_heuristic, pattern_database_heuristic]
+
+
+def random_states(count, seed):
+    rng = random.Random(seed)
+    return [generate_solvable_state(3, rng=rng) for _ in range(count)]
+
+
+@pytest.mark.parametrize("heuristic", ADMISSIBLE, ids=lambda heuristic: heuristic.__name__)
+def test_heuristic_never_overestimates(heuristic):
+    table = load_distance_table(3)
+    context = HeuristicContext(3, default_goal(3))
+    for state in random_states(200, seed=3):
+        context.state = tuple(state)
+        assert heuristic(context) <= table.distance(state)
+
+
+@pytest.mark.parametrize("heuristic", [linear_conflict_heuristic, walking_distance_heuristic],
+                         ids=lambda heuristic: heuristic.__name__)
+def test_astar_length_matches_manhattan(heuristic):
+    table = load_distance_table(3)
+    for state in random_states(10, seed=4):
+        expected, _ = search(N_Puzzle(3, state=state), manhattan_heuristic, "astar")
+        moves, _ = search(N_Puzzle(3, state=state), heuristic, "astar")
+        assert len(moves) == len(expected) == table.distance(state)
@@ -0,0 +1,38 @@
+import pickle
+import time
+
+import pytest
+
+from heuristics import manhattan_heuristic, misplaced_tiles_heuristic
+from parallel import parallelIdaStar
+from puzzle import N_Puzzle
+from utils import SearchLimitReached, solve_puzzle
+
+# Takes misplaced-tiles IDA* far longer than the deadlines used here
+HARD_15_PUZZLE = [0, 12, 9, 13, 15, 11, 10, 14, 3, 7, 2, 5, 4, 8, 6, 1]
+
+# 31 moves from the goal
+HARD_8_PUZZLE = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+
+
+def test_search_limit_reached_pickles():
+    error = pickle.loads(pickle.dumps(SearchLimitReached("timeout", 5)))
+    assert (error.reason, error.expanded) == ("timeout", 5)
+    assert str(error) == "search stopped (timeout) after expanding 5 nodes"
+
+
+def test_parallel_ida_star_deadline_raises_search_limit_reached():
+    puzzle = N_Puzzle(4, state=HARD_15_PUZZLE)
+    with pytest.raises(SearchLimitReached) as raised:
+        parallelIdaStar(puzzle, misplaced_tiles_heuristic, workers=2, deadline=time.time() + 0.5)
+    assert raised.value.reason == "timeout"
+
+
+def test_workers_rejected_for_other_algorithms():
+    with pytest.raises(ValueError, match="only supported by the 'ida' algorithm"):
+        solve_puzzle(N_Puzzle(3, state=HARD_8_PUZZLE), manhattan_heuristic, workers=2)
+
+
+def test_workers_with_ida_finds_optimal_solution():
+    _, num_moves, _, _ = solve_puzzle(N_Puzzle(3, state=HARD_8_PUZZLE), manhattan_heuristic, "ida", workers=2)
+    assert num_moves == 31
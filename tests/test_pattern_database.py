@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+import pattern_database
+from pattern_database import (PatternDatabase, build_pattern_database, load_pattern_database,
+                              pattern_database_heuristic, save_pattern_database)
+from puzzle import N_Puzzle
+
+
+@pytest.fixture
+def table_dir(tmp_path, monkeypatch):
+    """Point the default table files at an empty directory."""
+    monkeypatch.setattr(pattern_database, "TABLE_DIR", str(tmp_path))
+    monkeypatch.setattr(pattern_database, "_databases", {})
+    return tmp_path
+
+
+def test_small_database_built_on_first_use(table_dir):
+    puzzle = N_Puzzle(3, state=[1, 2, 3, 4, 5, 6, 7, 0, 8])
+    assert pattern_database_heuristic(puzzle) == 1
+    assert os.listdir(table_dir) == ["pdb_3x3.bin"]
+
+
+def test_large_database_not_built_in_search(table_dir):
+    puzzle = N_Puzzle(4, state=list(range(1, 15)) + [0, 15])
+    with pytest.raises(FileNotFoundError, match="python pattern_database.py 4"):
+        pattern_database_heuristic(puzzle)
+    assert os.listdir(table_dir) == []
+
+
+def test_save_replaces_file_without_leftovers(table_dir):
+    path = str(table_dir / "pdb.bin")
+    tables = build_pattern_database(3)
+    goal = list(range(1, 9)) + [0]
+    for _ in range(2):
+        save_pattern_database(path, 3, goal, tables)
+    assert os.listdir(table_dir) == ["pdb.bin"]
+    database = PatternDatabase(path)
+    assert database.evaluate(goal) == 0
+    database.close()
+
+
+def test_explicit_build_flag_overrides_size_limit(table_dir):
+    with pytest.raises(FileNotFoundError):
+        load_pattern_database(3, build=False)
@@ -0,0 +1,44 @@
+from itertools import permutations
+from math import factorial
+
+import pytest
+
+from distance_table import load_distance_table
+from ranking import (lehmer_rank, lehmer_unrank, myrvold_ruskey_rank, myrvold_ruskey_unrank, rank_positions,
+                     solvable_count, solvable_index, unrank_positions)
+from solvability import is_solvable
+
+
+def test_rank_positions_round_trip():
+    ranks = set()
+    for positions in permutations(range(6), 3):
+        rank = rank_positions(positions, 6)
+        assert unrank_positions(rank, 3, 6) == list(positions)
+        ranks.add(rank)
+    assert ranks == set(range(6 * 5 * 4))
+
+
+def test_lehmer_rank_is_lexicographic_and_round_trips():
+    for expected, permutation in enumerate(permutations(range(5))):
+        assert lehmer_rank(permutation) == expected
+        assert lehmer_unrank(expected, 5) == list(permutation)
+
+
+def test_myrvold_ruskey_round_trip():
+    ranks = set()
+    for permutation in permutations(range(5)):
+        rank = myrvold_ruskey_rank(permutation)
+        assert myrvold_ruskey_unrank(rank, 5) == list(permutation)
+        ranks.add(rank)
+    assert ranks == set(range(factorial(5)))
+
+
+def test_solvable_index_is_perfect_on_solvable_states():
+    indices = {solvable_index(state) for state in permutations(range(4)) if is_solvable(state, dimension=2)}
+    assert indices == set(range(solvable_count(4)))
+
+
+def test_distance_table_rejects_unsolvable_state():
+    unsolvable = [2, 1, 3, 4, 5, 6, 7, 8, 0]
+    with pytest.raises(ValueError, match="not solvable"):
+        load_distance_table(3).solve(unsolvable)
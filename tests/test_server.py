@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from server import SolveServer, query
+
+# 31 moves; misplaced-tiles A* takes long enough for duplicates to overlap
+HARD_8_PUZZLE = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+HARD_15_PUZZLE = [0, 12, 9, 13, 15, 11, 10, 14, 3, 7, 2, 5, 4, 8, 6, 1]
+
+
+def serve(client, **settings):
+    """Run client(server, port) against a server on an ephemeral port."""
+    async def run():
+        server = SolveServer(workers=1, **settings)
+        await server.start(port=0)
+        try:
+            return await client(server, server.address[1])
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_identical_requests_share_one_search():
+    async def client(server, port):
+        return server, await query([{"state": HARD_8_PUZZLE}] * 5, port=port)
+
+    server, results = serve(client, heuristic="misplaced")
+    assert [result["num_moves"] for result in results] == [31] * 5
+    assert server.counters["searches"] == 1
+    assert server.counters["coalesced"] == 4
+
+
+def test_request_past_its_deadline_times_out():
+    async def client(server, port):
+        return await query([{"state": HARD_15_PUZZLE, "timeout": 0.05}], port=port)
+
+    result, = serve(client, heuristic="misplaced")
+    assert result["status"] == "timeout"
+
+
+def test_full_queue_holds_back_new_requests():
+    async def client(server, port):
+        # Distinct node limits keep the requests from being coalesced
+        tasks = [{"state": HARD_15_PUZZLE, "timeout": 1.0, "max_nodes": 10 ** 7 + number} for number in range(3)]
+        await server.enqueue(tasks[0])  # Taken by the only solver
+        await server.enqueue(tasks[1])  # Fills the queue
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(server.enqueue(tasks[2]), 0.3)
+
+    serve(client, heuristic="misplaced", queue_size=1)
+
+
+def test_garbage_gets_json_error_line():
+    async def client(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"this is not a state\n[1, 2, 3, 4, 5, 6, 7, 0, 9]\n")
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        await writer.wait_closed()
+        return replies
+
+    garbage, bad_state = serve(client)
+    assert (garbage["id"], garbage["status"]) == (0, "error")
+    assert (bad_state["id"], bad_state["status"]) == (1, "error")
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from solvability import count_inversions, default_goal, is_solvable
+
+
+def brute_force_inversions(values):
+    return sum(1 for i in range(len(values)) for j in range(i + 1, len(values)) if values[i] > values[j])
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 5, 16, 50])
+def test_count_inversions_matches_brute_force(size):
+    rng = random.Random(size)
+    for _ in range(20):
+        values = list(range(size))
+        rng.shuffle(values)
+        assert count_inversions(values) == brute_force_inversions(values)
+
+
+def test_count_inversions_with_gaps_in_values():
+    values = [40, 3, 17, 0, 99, 8]
+    assert count_inversions(values) == brute_force_inversions(values)
+
+
+def even_width_rule(state, dimension):
+    """The textbook test for even widths and the default goal."""
+    tiles = [tile for tile in state if tile]
+    row_from_bottom = dimension - state.index(0) // dimension
+    return (brute_force_inversions(tiles) + row_from_bottom) % 2 == 1
+
+
+@pytest.mark.parametrize("blank_row", range(4))
+def test_is_solvable_on_4x4_with_blank_on_each_row(blank_row):
+    rng = random.Random(blank_row)
+    seen = set()
+    for _ in range(50):
+        state = list(range(1, 16))
+        rng.shuffle(state)
+        state.insert(blank_row * 4 + rng.randrange(4), 0)
+        expected = even_width_rule(state, 4)
+        assert is_solvable(state, dimension=4) == expected
+        seen.add(expected)
+        # Swapping two tiles flips the answer without moving the blank
+        first, second = [i for i, tile in enumerate(state) if tile][:2]
+        state[first], state[second] = state[second], state[first]
+        assert is_solvable(state, dimension=4) != expected
+    assert seen == {True, False}
+
+
+def test_is_solvable_accepts_states_reached_by_moves():
+    rng = random.Random(4)
+    state = default_goal(4)
+    blank = 15
+    for _ in range(200):
+        row, col = divmod(blank, 4)
+        target = rng.choice([cell for cell, ok in ((blank - 4, row > 0), (blank + 4, row < 3),
+                                                   (blank - 1, col > 0), (blank + 1, col < 3)) if ok])
+        state[blank], state[target] = state[target], 0
+        blank = target
+        assert is_solvable(state, dimension=4)
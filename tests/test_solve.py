@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+from solve import main
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+def run(argv, capsys):
+    status = main(argv)
+    return status, [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_solves_state_from_arguments(capsys):
+    status, results = run(["1", "2", "3", "4", "5", "6", "7", "0", "8"], capsys)
+    assert status == 0
+    assert results[0]["moves"] == ["right"]
+
+
+def test_bad_tile_gives_error_line(capsys):
+    status, results = run(["1", "2", "3", "4", "5", "6", "7", "0", "9"], capsys)
+    assert status == 1
+    assert results[0]["status"] == "error"
+
+
+def test_unparsable_tiles_give_error_line(capsys):
+    status, results = run(["1", "2", "x"], capsys)
+    assert status == 1
+    assert results[0]["status"] == "error"
+
+
+def test_workers_with_default_algorithm_gives_error_line(capsys):
+    status, results = run(["1", "2", "3", "4", "5", "6", "7", "0", "8", "--workers", "2"], capsys)
+    assert status == 1
+    assert "only supported by the 'ida' algorithm" in results[0]["error"]
+
+
+def test_command_line_prints_json_not_traceback():
+    completed = subprocess.run([sys.executable, "-m", "solve", "1", "2", "3", "4", "5", "6", "7", "0", "9"],
+                               cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 1
+    assert "Traceback" not in completed.stderr
+    assert json.loads(completed.stdout)["status"] == "error"
@@ -0,0 +1,13 @@
+import queue
+
+from utils import solve_with_progress
+
+
+def broken_heuristic(puzzle):
+    raise RuntimeError("broken heuristic")
+
+
+def test_solve_with_progress_reports_unexpected_errors():
+    messages = queue.Queue()
+    solve_with_progress([1, 2, 3, 4, 5, 6, 7, 0, 8], list(range(1, 9)) + [0], 3, broken_heuristic, "astar", messages)
+    assert messages.get_nowait() == ("error", "broken heuristic")
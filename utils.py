@@ -1,18 +1,16 @@
-import random
 import time
-from heuristics import manhattan_heuristic, misplaced_tiles_heuristic, euclidean_heuristic, custom_heuristic
-from heapq import heappop, heappush
+from heuristics import tile_cost_table
+from heuristics import HeuristicContext, linear_conflict_heuristic
 
 from puzzle import N_Puzzle
+from packed_state import PackedState, pack, slide
+from moves import MOVE_OFFSETS, OPPOSITE_MOVES, neighbour_table, zobrist_hash, zobrist_table
+from frontier import make_frontier
+import solvability
 
 # Function to check if the puzzle is solvable
 def is_solvable(state, dimension):
-    inversions = 0
-    for i in range(len(state)):
-        for j in range(i + 1, len(state)):
-            if state[i] != 0 and state[j] != 0 and state[i] > state[j]:
-                inversions += 1
-    return inversions % 2 == 0
+    return solvability.is_solvable(state, dimension=dimension)
 
 # Function to generate the goal state for any given puzzle size
 def generate_goal_state(size):
@@ -21,11 +19,8 @@ def generate_goal_state(size):
 
 # Function to shuffle the puzzle randomly
 def generate_random_state(size):
-    state = generate_goal_state(size)
-    random.shuffle(state)
-    while not is_solvable(state, int(len(state)**0.5)):  # Ensure the shuffled state is solvable
-        random.shuffle(state)
-    return state
+    # One shuffle plus at most one parity-fixing swap
+    return solvability.generate_solvable_state(int(round(size ** 0.5)), generate_goal_state(size))
 
 # Function to solve the puzzle using a given heuristic
 # def solve_puzzle(puzzle, heuristic):
@@ -38,16 +33,102 @@ def generate_random_state(size):
 #     time_taken = end_time - start_time
 #     return time_taken, len(moves)
 
-def solve_puzzle(puzzle, heuristic):
+def solve_puzzle(puzzle, heuristic, algorithm="astar", **options):
+    """
+    Solve the puzzle and report how much work the search did.
+
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: A heuristic function to evaluate states.
+        algorithm (str): One of SEARCH_MODES ("astar", "weighted", "greedy"), "ida",
+                         "bidirectional" or "bidirectional-astar".
+        **options: Extra options for the search engine (e.g. weight=2.0, or
+                   workers=4 to split "ida" across processes).
+    Returns:
+        time_taken (float), num_moves (int), nodes_expanded (int), nodes_generated (int)
+    """
     if puzzle is None:
         raise ValueError("puzzle not initialized")
-    start_time = time.time()
-    moves, solved_state = bestFirstSearch(puzzle, heuristic)
-    end_time = time.time()
+    start_time = time.perf_counter()
+    moves, stats = search(puzzle, heuristic, algorithm, **options)
+    end_time = time.perf_counter()
 
     time_taken = end_time - start_time
     num_moves = len(moves) if moves else 0  # If no solution, moves = 0
-    return time_taken, num_moves
+    return time_taken, num_moves, stats["expanded"], stats["generated"]
+
+def solve_with_progress(state, goal, dimension, heuristic, algorithm, messages, **options):
+    """
+    Solve a puzzle and report on a queue; meant to run in a background process.
+
+    Puts ("progress", stats) while searching, then either
+    ("done", moves, stats, time_taken) or ("error", message).
+    """
+    puzzle = N_Puzzle(dimension, state=list(state), goal=list(goal))
+
+    def report(stats):
+        messages.put(("progress", stats))
+
+    try:
+        start_time = time.perf_counter()
+        moves, stats = search(puzzle, heuristic, algorithm, progress=report, **options)
+        messages.put(("done", moves, stats, time.perf_counter() - start_time))
+    except Exception as error:  # Anything uncaught would leave the GUI waiting forever
+        messages.put(("error", str(error)))
+
+def search(puzzle, heuristic, algorithm="astar", instrument=None, **options):
+    """
+    Run the selected search engine.
+
+    Args:
+        instrument (Instrumentation): Optional counters, timings and profiling
+                                      for this run (see instrumentation.py).
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated").
+    """
+    # Without this, IDA* on an unsolvable puzzle would never stop
+    if not solvability.is_solvable(puzzle.state, puzzle.goal, puzzle.dimension):
+        raise ValueError("No solution found: the puzzle is not solvable")
+    if instrument is None:
+        return _run_engine(puzzle, heuristic, algorithm, options)
+    if algorithm in INSTRUMENTED_ALGORITHMS and options.get("workers") in (None, 1):
+        options["instrument"] = instrument
+    moves, stats = instrument.run(_run_engine, puzzle, heuristic, algorithm, options)
+    instrument.finish(stats)
+    return moves, stats
+
+def _run_engine(puzzle, heuristic, algorithm, options):
+    workers = options.pop("workers", None)
+    if workers is not None and workers != 1:
+        if algorithm != "ida":
+            raise ValueError("workers= is only supported by the 'ida' algorithm")
+        from parallel import parallelIdaStar  # Imported here: parallel imports this module
+        return parallelIdaStar(puzzle, heuristic, workers=workers, **options)
+    if algorithm in SEARCH_MODES:
+        return bestFirstSearch(puzzle, heuristic, mode=algorithm, **options)
+    if algorithm == "ida":
+        return idaStar(puzzle, heuristic, **options)
+    if algorithm == "bidirectional":
+        return bidirectionalSearch(puzzle, heuristic, mode="bfs", **options)
+    if algorithm == "bidirectional-astar":
+        return bidirectionalSearch(puzzle, heuristic, mode="astar", **options)
+    if algorithm == "anytime":
+        from anytime import anytimeSearch  # Imported here: anytime imports this module
+        solution = None
+        for solution in anytimeSearch(puzzle, heuristic, **options):
+            pass  # Keep the last (best) solution found within the limits
+        return solution
+    if algorithm == "reduction":
+        from reduction import reductionSearch  # Imported here: reduction imports this module
+        return reductionSearch(puzzle, heuristic, **options)
+    if algorithm == "table":
+        from distance_table import tableSearch  # Imported here: distance_table imports this module
+        return tableSearch(puzzle, heuristic, **options)
+    if algorithm in ("vectorized", "vectorized-bfs"):
+        from vectorized import vectorizedSearch  # Imported here: NumPy is optional
+        return vectorizedSearch(puzzle, heuristic if algorithm == "vectorized" else None, **options)
+    raise ValueError(f"Unknown search algorithm: {algorithm}")
 
 # A* search algorithm (simplified version, assuming you have a working implementation)
 # def bestFirstSearch(puzzle, heuristic):
@@ -98,61 +179,456 @@ def solve_puzzle(puzzle, heuristic):
 
 #     raise ValueError("No solution found.")  # If the goal is not reachable
 
-def bestFirstSearch(puzzle, heuristic):
+class SearchLimitReached(Exception):
+    """Raised when a search runs out of its node budget or passes its deadline."""
+
+    def __init__(self, reason, expanded):
+        # Both values go to Exception.args, so the error survives pickling
+        # (parallel workers send it back to the parent process)
+        super().__init__(reason, expanded)
+        self.reason = reason  # "node_limit" or "timeout"
+        self.expanded = expanded
+
+    def __str__(self):
+        return f"search stopped ({self.reason}) after expanding {self.expanded} nodes"
+
+def check_limits(expanded, max_nodes, deadline):
+    """Raise SearchLimitReached once a node budget or deadline is used up."""
+    if max_nodes is not None and expanded > max_nodes:
+        raise SearchLimitReached("node_limit", expanded)
+    # Reading the clock on every node is wasteful; every 1024th is enough
+    if deadline is not None and expanded & 1023 == 0 and time.time() > deadline:
+        raise SearchLimitReached("timeout", expanded)
+
+# How often (in expanded nodes) the engines report progress
+PROGRESS_INTERVAL = 1000
+
+# Search modes supported by bestFirstSearch
+SEARCH_MODES = ("astar", "weighted", "greedy")
+
+# Every algorithm name accepted by search()
+ALGORITHMS = SEARCH_MODES + ("ida", "bidirectional", "bidirectional-astar", "anytime", "table",
+                             "reduction", "vectorized", "vectorized-bfs")
+
+# Those that always return an optimal solution (given an admissible heuristic).
+# anytime is not: within its limits it returns its best solution so far
+OPTIMAL_ALGORITHMS = ("astar", "ida", "bidirectional", "bidirectional-astar", "table", "vectorized",
+                      "vectorized-bfs")
+
+# Engines that report every expansion to an Instrumentation
+INSTRUMENTED_ALGORITHMS = SEARCH_MODES + ("ida", "bidirectional", "bidirectional-astar", "anytime")
+
+def make_evaluator(heuristic, dimension, goal, instrument=None):
+    """
+    Prepare a heuristic for repeated evaluation during a search.
+
+    Heuristics are called with one HeuristicContext per search instead of a
+    fresh N_Puzzle per node, so goal lookups come from the cached tables.
+    With an instrument, full evaluations are counted and timed.
+
+    Returns:
+        evaluate (callable): evaluate(state) -> h value for a full state.
+        costs (list or None): Per-tile cost table when the heuristic is separable,
+                              so callers can update h in O(1) per move.
+    """
+    costs = tile_cost_table(heuristic, dimension, goal)
+    context = HeuristicContext(dimension, goal)
+    if costs is not None:
+        def evaluate(state):
+            return sum(costs[tile][i] for i, tile in enumerate(state))
+    else:
+        def evaluate(state):
+            context.state = state
+            return heuristic(context)
+    if instrument is not None:
+        evaluate = instrument.wrap_evaluate(evaluate)
+    return evaluate, costs
+
+def bestFirstSearch(puzzle, heuristic, mode="astar", weight=1.0, max_nodes=None, deadline=None, progress=None,
+                    exact=None, frontier="auto", instrument=None):
     """
-    Perform Best-First Search to solve the puzzle.
+    Perform a best-first search (A*, weighted A* or greedy) to solve the puzzle.
     Args:
         puzzle: An instance of the N_Puzzle class.
         heuristic: A heuristic function to evaluate states.
+        mode (str): "astar" orders by g + h, "weighted" by g + weight * h
+                    and "greedy" by h alone.
+        weight (float): The weight w used by the "weighted" mode.
+        max_nodes (int): Give up after expanding this many nodes.
+        deadline (float): Give up once time.time() passes this value.
+        progress (callable): Called every PROGRESS_INTERVAL expansions with a
+                             dict of "expanded", "generated" and "frontier".
+        exact (callable): exact(state) -> known optimal moves to the goal, or None.
+                          Known distances replace h, and the search stops as
+                          soon as it expands a state with a known path.
+        frontier (str): Open list, "bucket", "heap" or "auto" (buckets when
+                        every priority is an integer, see frontier.py).
+        instrument (Instrumentation): Per-f-layer stats and peak sizes, see instrumentation.py.
     Returns:
         moves (list): A list of moves to solve the puzzle.
-        current_state: The final solved state.
+        stats (dict): Search counters ("expanded", "generated", "duplicates").
     """
-    start_state = puzzle.state  # Initial state of the puzzle
-    goal_state = puzzle.goal  # Goal state of the puzzle
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    if mode == "astar":
+        weight = 1
+    elif float(weight).is_integer():
+        weight = int(weight)  # Keeps priorities integral for the bucket frontier
+
+    start_state = PackedState(puzzle.state)  # Initial state of the puzzle
+    goal_key = pack(puzzle.goal)  # Goal state of the puzzle
     dimension = puzzle.dimension  # Dimension of the puzzle
-
-    # Priority queue (open list) initialized with the starting state
-    open_list = []
-    heappush(open_list, (heuristic(puzzle), start_state, None, None))  # (priority, state, parent, move)
-
-    # Explored states (closed list)
-    closed_list = set()
-
-    # Stores parent-child relationships for reconstructing the solution
+    cells = start_state.cells
+    evaluate, costs = make_evaluator(heuristic, dimension, puzzle.goal, instrument)
+
+    def priority(g, h):
+        if mode == "greedy":
+            return h
+        return g + weight * h
+
+    # Known optimal paths to the goal from states seen so far (see `exact`)
+    known_tails = {}
+
+    def exact_h(state, h):
+        tail = exact(state)
+        if tail is None:
+            return h
+        known_tails[state.key] = tail
+        return max(h, len(tail))
+
+    # States are stored as packed keys (see packed_state.py) rather than lists.
+    # Open list nodes: (h, g, key, zero_index), ordered by priority, then h.
+    # The stored h is the heuristic's own value, which the O(1) updates build on.
+    start_h = evaluate(start_state)
+    start_f = priority(0, exact_h(start_state, start_h) if exact else start_h)
+    open_list = make_frontier(frontier, isinstance(start_h, int) and isinstance(weight, int))
+    open_list.push(start_f, start_h, (start_h, 0, start_state.key, start_state.blank))
+
+    # Cheapest known cost to every state seen so far
+    best_g = {start_state.key: 0}
+
+    # The move that led to each state; parents are recovered by undoing it
     parent_map = {}
 
-    start_time = time.time()
+    neighbours = neighbour_table(dimension)
+    expanded = 0
+    generated = 1
+    duplicates = 0  # Stale open entries and children already reached as cheaply
 
     while open_list:
-        # Get the state with the lowest heuristic value
-        _, current_state, parent_state, move = heappop(open_list)
-        current_state_tuple= tuple(current_state)
+        h, g, current_key, zero_index = open_list.pop()
+        if g > best_g[current_key]:
+            duplicates += 1
+            continue  # A cheaper copy of this state was already expanded
 
         # If we reach the goal state, reconstruct the solution
-        if current_state == goal_state:
-            end_time = time.time()
-            moves = []
-            while current_state_tuple in parent_map:
-                current_state_tuple, move = parent_map[current_state_tuple]
-                moves.append(move)
-            moves.reverse()  # Reverse to get moves in the correct order
-            return moves, (end_time - start_time)
-
-        # Add the current state to the closed list
-        closed_list.add(current_state_tuple)
-
-        # Generate successors (neighbors)
-        neighbors = generate_successors(current_state, dimension)
-
-        for neighbor_state, move in neighbors:
-            neighbor_state_tuple= tuple(neighbor_state)
-            if neighbor_state_tuple not in closed_list:
-                parent_map[neighbor_state_tuple] = (current_state_tuple, move)
-                heappush(open_list, (heuristic(puzzle), neighbor_state, current_state, move))
+        if current_key == goal_key:
+            moves = reconstruct_moves(parent_map, current_key, zero_index, dimension)
+            return moves, {"expanded": expanded, "generated": generated, "duplicates": duplicates}
+        if current_key in known_tails:
+            # Its f used the exact distance, so this path is as good as any left
+            moves = reconstruct_moves(parent_map, current_key, zero_index, dimension)
+            return moves + known_tails[current_key], {"expanded": expanded, "generated": generated,
+                                                      "duplicates": duplicates}
+
+        expanded += 1
+        check_limits(expanded, max_nodes, deadline)
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress({"expanded": expanded, "generated": generated, "frontier": len(open_list)})
+        if instrument is not None:
+            instrument.expand(priority(g, h), len(open_list), len(best_g), expanded, generated)
+
+        for new_zero_index, move in neighbours[zero_index]:
+            # The tile at new_zero_index slides into the old blank position
+            neighbor_key, tile = slide(current_key, zero_index, new_zero_index)
+
+            new_g = g + 1
+            if mode == "greedy":
+                if neighbor_key in best_g:
+                    duplicates += 1
+                    continue
+            elif new_g >= best_g.get(neighbor_key, new_g + 1):
+                duplicates += 1
+                continue
+            best_g[neighbor_key] = new_g
+            parent_map[neighbor_key] = move
+
+            if costs is not None:
+                new_h = h - costs[tile][new_zero_index] + costs[tile][zero_index]
+            else:
+                new_h = evaluate(PackedState.from_key(neighbor_key, cells, new_zero_index))
+            new_f = priority(new_g, new_h)
+            if exact is not None:
+                new_f = priority(new_g, exact_h(PackedState.from_key(neighbor_key, cells, new_zero_index), new_h))
+            open_list.push(new_f, new_h, (new_h, new_g, neighbor_key, new_zero_index))
+            generated += 1
 
     raise ValueError("No solution found!")
 
+def idaStar(puzzle, heuristic, max_nodes=None, deadline=None, progress=None, instrument=None):
+    """
+    Perform Iterative Deepening A* to solve the puzzle.
+
+    A single state list is modified in place and restored on backtrack, so
+    memory stays O(depth) instead of growing with every visited state.
+    Each node's Zobrist hash (see moves.py) is passed down the recursion,
+    so the goal test is one int compare and undoing a move needs no rehash.
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: A heuristic function to evaluate states.
+        max_nodes (int): Give up after expanding this many nodes.
+        deadline (float): Give up once time.time() passes this value.
+        progress (callable): Called every PROGRESS_INTERVAL expansions with a
+                             dict of "expanded", "generated" and "frontier".
+        instrument (Instrumentation): Per-threshold stats and peak depth, see instrumentation.py.
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated").
+    """
+    dimension = puzzle.dimension
+    state = list(puzzle.state)
+    goal_state = list(puzzle.goal)
+    goal_hash = zobrist_hash(goal_state, dimension)
+    neighbours = neighbour_table(dimension)
+    zobrist = zobrist_table(dimension)
+    evaluate, costs = make_evaluator(heuristic, dimension, puzzle.goal, instrument)
+
+    path = []
+    expanded = 0
+    generated = 1
+
+    def dfs(g, h, zero_index, previous_blank, key, bound):
+        """Return the smallest f above bound, or None once the goal is reached."""
+        nonlocal expanded, generated
+        f = g + h
+        if f > bound:
+            return f
+        if key == goal_hash and state == goal_state:
+            return None
+        expanded += 1
+        check_limits(expanded, max_nodes, deadline)
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            # The frontier of a depth-first search is just the current path
+            progress({"expanded": expanded, "generated": generated, "frontier": len(path), "bound": bound})
+        if instrument is not None:
+            instrument.expand(bound, len(path), 0, expanded, generated)
+
+        # Score every child first so the most promising one is searched first
+        children = []
+        for new_zero_index, move in neighbours[zero_index]:
+            if new_zero_index == previous_blank:
+                continue  # Never undo the move that led here
+            tile = state[new_zero_index]
+            if costs is not None:
+                new_h = h - costs[tile][new_zero_index] + costs[tile][zero_index]
+            else:
+                state[zero_index], state[new_zero_index] = tile, 0
+                new_h = evaluate(state)
+                state[zero_index], state[new_zero_index] = 0, tile
+            children.append((new_h, move, new_zero_index))
+        children.sort(key=lambda child: child[0])
+        generated += len(children)
+
+        next_bound = float("inf")
+        for new_h, move, new_zero_index in children:
+            tile = state[new_zero_index]
+            state[zero_index], state[new_zero_index] = tile, 0  # Move
+            path.append(move)
+            keys = zobrist[tile]
+            result = dfs(g + 1, new_h, new_zero_index, zero_index, key ^ keys[new_zero_index] ^ keys[zero_index],
+                         bound)
+            if result is None:
+                return None
+            path.pop()
+            state[zero_index], state[new_zero_index] = 0, tile  # Undo
+            next_bound = min(next_bound, result)
+        return next_bound
+
+    start_h = evaluate(state)
+    start_key = zobrist_hash(state, dimension)
+    bound = start_h
+    while True:
+        result = dfs(0, start_h, state.index(0), None, start_key, bound)
+        if result is None:
+            return path, {"expanded": expanded, "generated": generated}
+        if result == float("inf"):
+            raise ValueError("No solution found!")
+        bound = result
+
+def bidirectionalSearch(puzzle, heuristic=None, mode="bfs", max_nodes=None, deadline=None, progress=None,
+                        frontier="auto", instrument=None):
+    """
+    Search from the start and the goal at the same time until the two searches meet.
+
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: A heuristic function, used by the "astar" mode only.
+        mode (str): "bfs" runs breadth-first layers from both ends (optimal, no
+                    heuristic needed); "astar" runs front-to-end A* from both
+                    ends, each side estimating the distance to the other end.
+        max_nodes (int): Give up after expanding this many nodes.
+        deadline (float): Give up once time.time() passes this value.
+        progress (callable): Called every PROGRESS_INTERVAL expansions with a
+                             dict of "expanded", "generated" and "frontier".
+        frontier (str): Open lists of the "astar" mode, see bestFirstSearch.
+        instrument (Instrumentation): Per-layer stats and peak sizes, see instrumentation.py.
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated", "duplicates").
+    """
+    start_state = PackedState(puzzle.state)
+    goal_state = PackedState(puzzle.goal)
+    if start_state == goal_state:
+        return [], {"expanded": 0, "generated": 1}
+    if mode == "bfs":
+        return _bidirectional_bfs(start_state, goal_state, puzzle.dimension, max_nodes, deadline, progress,
+                                  instrument)
+    if mode == "astar":
+        return _bidirectional_astar(start_state, goal_state, puzzle.dimension, heuristic, max_nodes, deadline,
+                                    progress, frontier, instrument)
+    raise ValueError(f"Unknown bidirectional mode: {mode}")
+
+def _join_paths(forward_parents, backward_parents, meeting, dimension):
+    """Join the start->meeting and goal->meeting half-paths into one move list."""
+    forward = reconstruct_moves(forward_parents, meeting.key, meeting.blank, dimension)
+    backward = reconstruct_moves(backward_parents, meeting.key, meeting.blank, dimension)
+    # Walking the backward half from the meeting point undoes its moves in reverse
+    return forward + [OPPOSITE_MOVES[move] for move in reversed(backward)]
+
+def _bidirectional_bfs(start_state, goal_state, dimension, max_nodes=None, deadline=None, progress=None,
+                       instrument=None):
+    # For each side: depth of every seen state and the move that reached it
+    depths = ({start_state.key: 0}, {goal_state.key: 0})
+    parents = ({}, {})
+    frontiers = ([start_state], [goal_state])
+    expanded = 0
+    generated = 2
+    duplicates = 0
+
+    while frontiers[0] and frontiers[1]:
+        # Grow the smaller frontier by one full layer
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other_seen, parent_map = depths[side], depths[1 - side], parents[side]
+        best_total, meeting = None, None
+        next_frontier = []
+        for state in frontiers[side]:
+            expanded += 1
+            check_limits(expanded, max_nodes, deadline)
+            if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+                progress({"expanded": expanded, "generated": generated,
+                          "frontier": len(frontiers[0]) + len(frontiers[1]) + len(next_frontier)})
+            depth = seen[state.key] + 1
+            if instrument is not None:
+                instrument.expand(("forward", "backward")[side] + f" {depth - 1}",
+                                  len(frontiers[0]) + len(frontiers[1]) + len(next_frontier),
+                                  len(depths[0]) + len(depths[1]), expanded, generated)
+            for neighbor_state, move in generate_successors(state, dimension):
+                if neighbor_state.key in seen:
+                    duplicates += 1
+                    continue
+                seen[neighbor_state.key] = depth
+                parent_map[neighbor_state.key] = move
+                next_frontier.append(neighbor_state)
+                generated += 1
+                if neighbor_state.key in other_seen:
+                    total = depth + other_seen[neighbor_state.key]
+                    if best_total is None or total < best_total:
+                        best_total, meeting = total, neighbor_state
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        # The whole layer has been generated, so the cheapest meeting is optimal
+        if meeting is not None:
+            moves = _join_paths(parents[0], parents[1], meeting, dimension)
+            return moves, {"expanded": expanded, "generated": generated, "duplicates": duplicates}
+
+    raise ValueError("No solution found!")
+
+def _bidirectional_astar(start_state, goal_state, dimension, heuristic, max_nodes=None, deadline=None, progress=None,
+                         frontier="auto", instrument=None):
+    if heuristic is None:
+        raise ValueError("bidirectional A* needs a heuristic")
+    # Front-to-end: the forward side aims at the goal, the backward side at the start
+    forward = make_evaluator(heuristic, dimension, goal_state, instrument)[0]
+    backward = make_evaluator(heuristic, dimension, start_state, instrument)[0]
+    try:
+        backward_h = backward(goal_state)
+    except ValueError:
+        # Tables built for one goal (the pattern database) cannot aim at the
+        # start; any admissible heuristic on that side keeps the search optimal
+        backward = make_evaluator(linear_conflict_heuristic, dimension, start_state, instrument)[0]
+        backward_h = backward(goal_state)
+    evaluators = (forward, backward)
+    best_g = ({start_state.key: 0}, {goal_state.key: 0})
+    parents = ({}, {})
+    start_hs = (forward(start_state), backward_h)
+    integral = all(isinstance(h, int) for h in start_hs)
+    open_lists = (make_frontier(frontier, integral), make_frontier(frontier, integral))
+    open_lists[0].push(start_hs[0], start_hs[0], (0, start_state))
+    open_lists[1].push(start_hs[1], start_hs[1], (0, goal_state))
+    expanded = 0
+    generated = 2
+    duplicates = 0
+    best_total, meeting = float("inf"), None
+
+    while open_lists[0] and open_lists[1]:
+        # Neither side can find anything cheaper than the best meeting so far
+        if best_total <= max(open_lists[0].min_priority(), open_lists[1].min_priority()):
+            break
+        side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+        open_list, evaluate = open_lists[side], evaluators[side]
+        g_values, other_g_values, parent_map = best_g[side], best_g[1 - side], parents[side]
+
+        g, state = open_list.pop()
+        if g > g_values[state.key]:
+            duplicates += 1
+            continue  # A cheaper copy of this state was already expanded
+        expanded += 1
+        check_limits(expanded, max_nodes, deadline)
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress({"expanded": expanded, "generated": generated,
+                      "frontier": len(open_lists[0]) + len(open_lists[1])})
+        if instrument is not None:
+            # Layers by the f bound below which both sides have finished
+            instrument.expand(max(open_lists[0].min_priority() if open_lists[0] else 0,
+                                  open_lists[1].min_priority() if open_lists[1] else 0),
+                              len(open_lists[0]) + len(open_lists[1]), len(best_g[0]) + len(best_g[1]),
+                              expanded, generated)
+        for neighbor_state, move in generate_successors(state, dimension):
+            new_g = g + 1
+            if new_g >= g_values.get(neighbor_state.key, new_g + 1):
+                duplicates += 1
+                continue
+            g_values[neighbor_state.key] = new_g
+            parent_map[neighbor_state.key] = move
+            new_h = evaluate(neighbor_state)
+            open_list.push(new_g + new_h, new_h, (new_g, neighbor_state))
+            generated += 1
+            if neighbor_state.key in other_g_values:
+                total = new_g + other_g_values[neighbor_state.key]
+                if total < best_total:
+                    best_total, meeting = total, neighbor_state
+
+    if meeting is None:
+        raise ValueError("No solution found!")
+    moves = _join_paths(parents[0], parents[1], meeting, dimension)
+    return moves, {"expanded": expanded, "generated": generated, "duplicates": duplicates}
+
+def reconstruct_moves(parent_map, key, zero_index, dimension):
+    """
+    Rebuild the move list from a map of packed state key -> move that reached it.
+
+    Each parent is recovered by sliding the blank back against the move.
+    """
+    moves = []
+    while key in parent_map:
+        move = parent_map[key]
+        row_offset, col_offset = MOVE_OFFSETS[move]
+        previous_zero_index = zero_index - (row_offset * dimension + col_offset)
+        key, _ = slide(key, zero_index, previous_zero_index)
+        zero_index = previous_zero_index
+        moves.append(move)
+    moves.reverse()  # Reverse to get moves in the correct order
+    return moves
+
 def reconstruct_path(came_from, current_state):
     total_path = [current_state]
     while current_state in came_from:
@@ -166,41 +642,22 @@ def generate_successors(state, dimension):
     Generate all possible successors of the current state.
     
     Parameters:
-        state (list): The current state of the puzzle (1D list).
+        state (list or PackedState): The current state of the puzzle.
         dimension (int): The dimension of the puzzle (e.g., 3 for 8-puzzle).
     
     Returns:
-        List[Tuple[List[int], str]]: A list of tuples, where each tuple contains
-                                     a new state (1D list) and the move as a string.
+        List[Tuple[state, str]]: A list of tuples, where each tuple contains
+                                 a new state (same type as `state`) and the move as a string.
     """
-    successors = []
-    zero_index = state.index(0)  # Find the blank space (0)
-
-    # Define possible moves (row_offset, col_offset, move_name)
-    moves = {
-        "up": (-1, 0),
-        "down": (1, 0),
-        "left": (0, -1),
-        "right": (0, 1)
-    }
-
-    # Convert 1D index to 2D row and column
-    row, col = divmod(zero_index, dimension)
-
-    for move, (row_offset, col_offset) in moves.items():
-        new_row, new_col = row + row_offset, col + col_offset
-
-        # Check if the move is within bounds
-        if 0 <= new_row < dimension and 0 <= new_col < dimension:
-            # Calculate new 1D index for the blank space
-            new_zero_index = new_row * dimension + new_col
-
-            # Swap the blank space with the target tile to create a new state
-            new_state = state[:]
-            new_state[zero_index], new_state[new_zero_index] = new_state[new_zero_index], new_state[zero_index]
-
-            # Append the new state and the move to successors
-            successors.append((new_state, move))
+    zero_index = state.index(0)  # O(1) for a PackedState, which caches the blank
+    if isinstance(state, PackedState):
+        return [(state.slide(target), move) for target, move in neighbour_table(dimension)[zero_index]]
 
+    successors = []
+    for target, move in neighbour_table(dimension)[zero_index]:
+        # Swap the blank space with the target tile to create a new state
+        new_state = state[:]
+        new_state[zero_index], new_state[target] = new_state[target], 0
+        successors.append((new_state, move))
     return successors
 
@@ -0,0 +1,252 @@
+import time
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+from heuristics import (goal_tables, line_conflict_table, linear_conflict_heuristic, manhattan_heuristic,
+                        misplaced_tiles_heuristic)
+from packed_state import MAX_NIBBLE_CELLS
+from utils import MOVE_OFFSETS, OPPOSITE_MOVES, PROGRESS_INTERVAL, SearchLimitReached, make_evaluator
+
+# Moves by id; layers store the id of the move that produced each state
+MOVE_NAMES = tuple(MOVE_OFFSETS)
+OPPOSITE_IDS = tuple(MOVE_NAMES.index(OPPOSITE_MOVES[move]) for move in MOVE_NAMES)
+NO_MOVE = -1
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("the vectorized search needs NumPy (pip install numpy)")
+
+
+@lru_cache(maxsize=8)
+def move_target_array(dimension):
+    """
+    For every move id and blank index, the index the blank moves to (-1 if off the board).
+
+    Returns:
+        numpy.ndarray: int64 array of shape (4, cells).
+    """
+    targets = np.full((len(MOVE_NAMES), dimension * dimension), -1, dtype=np.int64)
+    for move_id, move in enumerate(MOVE_NAMES):
+        row_offset, col_offset = MOVE_OFFSETS[move]
+        for i in range(dimension * dimension):
+            row, col = divmod(i, dimension)
+            if 0 <= row + row_offset < dimension and 0 <= col + col_offset < dimension:
+                targets[move_id, i] = i + row_offset * dimension + col_offset
+    return targets
+
+
+class BatchTables:
+    """GoalTables as NumPy arrays, indexed as table[tile, index] so whole layers can be gathered at once."""
+
+    def __init__(self, dimension, goal):
+        tables = goal_tables(dimension, tuple(goal))
+        cells = dimension * dimension
+        self.dimension = dimension
+        self.cells = np.arange(cells)
+        self.misplaced = np.array(tables.misplaced, dtype=np.uint8)
+        self.manhattan = np.array(tables.manhattan, dtype=np.uint8)
+
+        # Linear conflict: each tile's digit of its row and column code (see
+        # line_conflict_table), already multiplied by its place value
+        base = dimension + 1
+        self.row_digits = np.zeros((cells, cells), dtype=np.int32)
+        self.col_digits = np.zeros((cells, cells), dtype=np.int32)
+        for tile in range(cells):
+            goal_row, goal_col = tables.goal_row[tile], tables.goal_col[tile]
+            for i in range(cells):
+                row, col = divmod(i, dimension)
+                row_digit = goal_col if tile and goal_row == row else dimension
+                col_digit = goal_row if tile and goal_col == col else dimension
+                self.row_digits[tile, i] = row_digit * base ** col
+                self.col_digits[tile, i] = col_digit * base ** row
+        self.conflicts = np.frombuffer(bytes(line_conflict_table(dimension)), dtype=np.uint8)
+
+
+@lru_cache(maxsize=8)
+def batch_tables(dimension, goal):
+    return BatchTables(dimension, goal)
+
+
+def misplaced_batch(states, tables):
+    """Misplaced tiles of every row of a (n, cells) uint8 array."""
+    return tables.misplaced[states, tables.cells].sum(axis=1, dtype=np.int32)
+
+
+def manhattan_batch(states, tables):
+    """Manhattan distance of every row of a (n, cells) uint8 array."""
+    return tables.manhattan[states, tables.cells].sum(axis=1, dtype=np.int32)
+
+
+def linear_conflict_batch(states, tables):
+    """Linear conflict heuristic of every row of a (n, cells) uint8 array."""
+    n, dimension = len(states), tables.dimension
+    row_codes = tables.row_digits[states, tables.cells].reshape(n, dimension, dimension).sum(axis=2)
+    col_codes = tables.col_digits[states, tables.cells].reshape(n, dimension, dimension).sum(axis=1)
+    conflicts = tables.conflicts[row_codes].sum(axis=1, dtype=np.int32)
+    conflicts += tables.conflicts[col_codes].sum(axis=1, dtype=np.int32)
+    return manhattan_batch(states, tables) + conflicts
+
+
+# Heuristics with a vectorized version; any other one is evaluated row by row
+BATCH_HEURISTICS = {
+    misplaced_tiles_heuristic: misplaced_batch,
+    manhattan_heuristic: manhattan_batch,
+    linear_conflict_heuristic: linear_conflict_batch,
+}
+
+
+def evaluate_batch(heuristic, states, dimension, goal):
+    """
+    Heuristic values of a whole layer.
+
+    Args:
+        heuristic: A heuristic function (see heuristics.HEURISTICS).
+        states (numpy.ndarray): (n, cells) uint8 array, one state per row.
+        dimension (int): The board dimension.
+        goal (sequence): The goal state.
+    Returns:
+        numpy.ndarray: One value per row.
+    """
+    require_numpy()
+    batch = BATCH_HEURISTICS.get(heuristic)
+    if batch is not None:
+        return batch(states, batch_tables(dimension, tuple(goal)))
+    evaluate, _ = make_evaluator(heuristic, dimension, goal)
+    return np.fromiter((evaluate(row.tolist()) for row in states), dtype=np.float64, count=len(states))
+
+
+def pack_keys(states):
+    """
+    One sortable key per row, matching packed_state.pack for boards up to 4x4.
+
+    Larger boards use the raw row bytes as a fixed-size void scalar.
+    """
+    cells = states.shape[1]
+    if cells <= MAX_NIBBLE_CELLS:
+        padded = np.zeros((len(states), MAX_NIBBLE_CELLS), dtype=np.uint8)
+        padded[:, :cells] = states
+        # Two tiles per byte, low nibble first: read as little-endian, tile i sits in bits 4*i .. 4*i+3
+        nibbles = padded[:, 0::2] | (padded[:, 1::2] << 4)
+        return nibbles.view("<u8").ravel()
+    return np.ascontiguousarray(states).view(np.dtype((np.void, cells))).ravel()
+
+
+def expand_layer(states, blanks, previous_moves, dimension):
+    """
+    Generate the children of every state in a layer with fancy-indexed swaps.
+
+    Moves that undo the move leading to a state are skipped.
+
+    Returns:
+        children (numpy.ndarray): (m, cells) uint8 child states.
+        child_blanks (numpy.ndarray): Blank index of every child.
+        parents (numpy.ndarray): Row of every child's parent in `states`.
+        moves (numpy.ndarray): Id of the move (see MOVE_NAMES) producing every child.
+    """
+    targets = move_target_array(dimension)
+    children, child_blanks, parents, moves = [], [], [], []
+    for move_id in range(len(MOVE_NAMES)):
+        target = targets[move_id][blanks]
+        rows = np.flatnonzero((target >= 0) & (previous_moves != OPPOSITE_IDS[move_id]))
+        child = states[rows]
+        target = target[rows]
+        blank = blanks[rows]
+        index = np.arange(len(rows))
+        child[index, blank] = child[index, target]  # The tile slides into the blank
+        child[index, target] = 0
+        children.append(child)
+        child_blanks.append(target)
+        parents.append(rows)
+        moves.append(np.full(len(rows), move_id, dtype=np.int8))
+    return np.concatenate(children), np.concatenate(child_blanks), np.concatenate(parents), np.concatenate(moves)
+
+
+def vectorizedSearch(puzzle, heuristic=None, max_nodes=None, deadline=None, progress=None):
+    """
+    Breadth-first search that expands, scores and deduplicates whole layers with NumPy.
+
+    Without a heuristic it is a plain breadth-first search. With one, every
+    iteration only keeps states with depth + h within a bound, raising the
+    bound to the smallest pruned f until the goal is reached (breadth-first
+    iterative-deepening A*), so the answer stays optimal for an admissible
+    heuristic. The board graph is bipartite, so a new layer only needs to
+    be checked against the previous one for duplicates; only those two
+    layers are kept, plus the parent row and move id of every state.
+    Args:
+        puzzle: An instance of the N_Puzzle class.
+        heuristic: A heuristic function, or None for plain breadth-first search.
+        max_nodes (int): Give up after expanding this many nodes (checked per layer).
+        deadline (float): Give up once time.time() passes this value (checked per layer).
+        progress (callable): Called after every layer of at least PROGRESS_INTERVAL
+                             states with a dict of "expanded", "generated", "frontier"
+                             and "bound".
+    Returns:
+        moves (list): A list of moves to solve the puzzle.
+        stats (dict): Search counters ("expanded", "generated").
+    """
+    require_numpy()
+    dimension = puzzle.dimension
+    goal = list(puzzle.goal)
+    start = np.array([list(puzzle.state)], dtype=np.uint8)
+    goal_key = pack_keys(np.array([goal], dtype=np.uint8))[0]
+    expanded = 0
+    generated = 1
+    bound = float("inf") if heuristic is None else evaluate_batch(heuristic, start, dimension, goal)[0]
+
+    while True:
+        states = start
+        keys = pack_keys(states)
+        blanks = np.flatnonzero(states[0] == 0)
+        previous_moves = np.array([NO_MOVE], dtype=np.int8)
+        previous_keys = keys[:0]
+        history = []  # (parents, moves) of every layer after the first
+        next_bound = float("inf")
+        depth = 0
+
+        while len(states):
+            found = np.flatnonzero(keys == goal_key)
+            if len(found):
+                row = found[0]
+                moves = []
+                for parents, layer_moves in reversed(history):
+                    moves.append(MOVE_NAMES[layer_moves[row]])
+                    row = parents[row]
+                moves.reverse()
+                return moves, {"expanded": expanded, "generated": generated}
+
+            expanded += len(states)
+            if max_nodes is not None and expanded > max_nodes:
+                raise SearchLimitReached("node_limit", expanded)
+            if deadline is not None and time.time() > deadline:
+                raise SearchLimitReached("timeout", expanded)
+
+            children, child_blanks, parents, moves = expand_layer(states, blanks, previous_moves, dimension)
+            generated += len(children)
+            child_keys, first = np.unique(pack_keys(children), return_index=True)
+            # Drop states already seen in the previous layer (both key arrays are sorted)
+            if len(previous_keys):
+                position = np.searchsorted(previous_keys, child_keys).clip(max=len(previous_keys) - 1)
+                new = previous_keys[position] != child_keys
+                child_keys, first = child_keys[new], first[new]
+            if heuristic is not None and len(first):
+                f = depth + 1 + evaluate_batch(heuristic, children[first], dimension, goal)
+                within = f <= bound
+                if not within.all():
+                    next_bound = min(next_bound, f[~within].min())
+                child_keys, first = child_keys[within], first[within]
+
+            previous_keys, keys = keys, child_keys
+            states, blanks, previous_moves = children[first], child_blanks[first], moves[first]
+            history.append((parents[first], moves[first]))
+            depth += 1
+            if progress is not None and len(states) >= PROGRESS_INTERVAL:
+                progress({"expanded": expanded, "generated": generated, "frontier": len(states), "bound": bound})
+
+        if next_bound == float("inf"):
+            raise ValueError("No solution found!")
+        bound = next_bound